@@ -13,6 +13,7 @@ import requests
 import threading
 from flask import Flask, jsonify, request
 import config
+import http_pool
 
 app = Flask(__name__)
 
@@ -112,7 +113,7 @@ def fetch_token_info(contract_address):
     """通过搜索 API 获取代币信息和市值"""
     try:
         url = f"{config.BINANCE_SEARCH_URL}?keyword={requests.utils.quote(contract_address)}&chainIds={config.BINANCE_SEARCH_CHAINS}"
-        resp = requests.get(
+        resp = http_pool.get_session('binance').get(
             url,
             headers=config.HEADERS,
             cookies=config.COOKIES,
@@ -354,7 +355,8 @@ def api_status():
         'total_contracts': stats['total_contracts'],
         'last_call': stats['last_call'],
         'monitoring': monitoring_count,
-        'doubled': stats['doubled']
+        'doubled': stats['doubled'],
+        'http_pool': http_pool.get_pool_stats(),
     })
 
 
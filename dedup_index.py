@@ -0,0 +1,70 @@
+"""
+有界去重索引
+- 按到达时间分桶，超过 TTL 未再出现的 ID 整桶淘汰，内存有上限
+- 命中时刷新到当前桶（LRU），接口持续返回的事件不会被提前淘汰
+- 记录命中率，供 /status 展示
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class DedupIndex:
+    """时间分桶的 TTL/LRU 去重索引"""
+
+    def __init__(self, ttl, bucket_seconds=60):
+        self.ttl = ttl
+        self.bucket_seconds = bucket_seconds
+        self._index = {}                # item_id -> bucket_id
+        self._buckets = OrderedDict()   # bucket_id -> set(item_id)，按时间升序
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+    def __len__(self):
+        return len(self._index)
+
+    def _evict(self, current_bucket):
+        """淘汰超过 TTL 的桶（调用方持有锁）"""
+        oldest_kept = current_bucket - int(self.ttl // self.bucket_seconds)
+        while self._buckets:
+            bucket_id = next(iter(self._buckets))
+            if bucket_id >= oldest_kept:
+                break
+            ids = self._buckets.pop(bucket_id)
+            for item_id in ids:
+                del self._index[item_id]
+            self.evicted += len(ids)
+
+    def check_and_add(self, item_id, now=None):
+        """已存在返回 True（并刷新到当前桶）；否则记录并返回 False"""
+        bucket_id = int((now if now is not None else time.time()) // self.bucket_seconds)
+        with self._lock:
+            self._evict(bucket_id)
+            old_bucket = self._index.get(item_id)
+            if old_bucket is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+            if old_bucket != bucket_id:
+                if old_bucket is not None:
+                    self._buckets[old_bucket].discard(item_id)
+                self._index[item_id] = bucket_id
+                if bucket_id not in self._buckets:
+                    self._buckets[bucket_id] = set()
+                self._buckets[bucket_id].add(item_id)
+            return old_bucket is not None
+
+    def get_stats(self):
+        """返回索引大小和命中率"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._index),
+                'buckets': len(self._buckets),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evicted': self.evicted,
+                'hit_rate': round(self.hits / total, 4) if total else 0,
+            }
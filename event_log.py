@@ -0,0 +1,89 @@
+"""
+有界事件日志
+- 固定容量环形缓冲区，内存占用恒定
+- 每条事件分配递增序号 (seq)，订阅者各自维护游标
+- 新事件通过 Condition 唤醒等待中的订阅者，无需轮询
+- 配合 SSE 的 id / Last-Event-ID 实现断线续传，id 带进程启动标识，服务重启后不会误续传
+"""
+import threading
+import time
+
+# 进程启动标识（毫秒时间戳的十六进制），作为 SSE id 的前缀：<启动标识>-<序号>
+BOOT_EPOCH = format(int(time.time() * 1000), 'x')
+
+
+class EventLog:
+    """序号递增的环形事件日志"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._slots = [None] * capacity
+        self._last_seq = 0  # 最新事件序号（0 表示尚无事件）
+        self._cond = threading.Condition()
+
+    @property
+    def last_seq(self):
+        return self._last_seq
+
+    @property
+    def first_seq(self):
+        """缓冲区中最早一条事件的序号"""
+        return max(1, self._last_seq - self.capacity + 1)
+
+    def __len__(self):
+        return min(self._last_seq, self.capacity)
+
+    def append(self, item):
+        """追加事件并唤醒所有订阅者，返回分配的序号"""
+        with self._cond:
+            self._last_seq += 1
+            seq = self._last_seq
+            self._slots[seq % self.capacity] = item
+            self._cond.notify_all()
+        return seq
+
+    def _collect(self, cursor):
+        """返回游标之后仍在缓冲区中的 [(seq, item)]（调用方持有锁）"""
+        start = max(cursor + 1, self.first_seq)
+        return [(seq, self._slots[seq % self.capacity]) for seq in range(start, self._last_seq + 1)]
+
+    def read_since(self, cursor, timeout=None):
+        """
+        读取游标之后的事件
+        - 没有新事件时阻塞等待，最长 timeout 秒
+        - 返回 [(seq, item)]，超时返回空列表
+        - 落后超过容量的订阅者从最早仍保留的事件继续
+        """
+        with self._cond:
+            if self._last_seq <= cursor:
+                self._cond.wait_for(lambda: self._last_seq > cursor, timeout)
+            return self._collect(cursor)
+
+    def latest(self, n):
+        """返回最近 n 条事件 [(seq, item)]，按序号升序"""
+        with self._cond:
+            return self._collect(max(0, self._last_seq - n))
+
+
+def format_event_id(seq):
+    """SSE 事件的 id 行"""
+    return f"id: {BOOT_EPOCH}-{seq}\n".encode('ascii')
+
+
+def parse_last_event_id(value, last_seq):
+    """
+    解析 SSE 客户端的 Last-Event-ID 请求头，返回续传游标
+    - 缺失或非法时返回 0（从头发送缓冲区内的事件）
+    - 启动标识与本进程不同说明服务已重启、序号已归零，同样从头发送
+      （只比较序号会漏掉重启后新序号已追上旧序号的情况）
+    """
+    epoch, _, seq = (value or '').strip().rpartition('-')
+    if epoch != BOOT_EPOCH:
+        return 0
+    try:
+        cursor = int(seq)
+    except ValueError:
+        return 0
+    if cursor < 0 or cursor > last_seq:
+        return 0
+    return cursor
@@ -0,0 +1,120 @@
+import os
+import sys
+import time
+import random
+import string
+
+# Ensure imports from current directory work
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from match_service.matchers import run_hardcoded_engine, MIN_MATCH_SCORE
+from match_service.pattern_index import HardcodedIndex
+from match_service.utils import match_name_in_tweet
+
+TOKEN_COUNTS = [1000, 10000]
+TWEET_COUNT = 200
+
+# 推文填充词（与代币名无关），以及生成代币名用的音节 / 汉字
+FILLER = ["just", "saw", "this", "today", "market", "looks", "great", "what", "do", "you", "think",
+          "about", "the", "new", "update", "from", "team", "big", "news", "coming", "soon", "gm"]
+SYLLABLES = ["ka", "zu", "mo", "ri", "ven", "tor", "lix", "pa", "qui", "dro", "fen", "ssa",
+             "bel", "nox", "tra", "vo", "gri", "mel", "sha", "dun", "ph", "yx", "or", "ez"]
+HANZI = "龙虎凤鹤猫狗熊鹰狼鲸星月日云雷风火山河海金银玉宝神仙侠客王侯将相天地人和福禄寿喜财"
+
+
+def reference_engine(tweet_text, tokens, local_cache=None, source='new'):
+    """逐个代币检查的原实现（用于校验结果一致）"""
+    matched = []
+    tweet_lower = tweet_text.lower()
+    for token in tokens:
+        symbol = (token.get('tokenSymbol') or token.get('symbol') or '').lower()
+        name = (token.get('tokenName') or token.get('name') or '').lower()
+        score, match_type, matched_word = 0, None, None
+        if local_cache is not None and symbol and symbol in local_cache:
+            score, match_type, matched_word = 5.0, "缓存命中", symbol
+        if score == 0 and symbol and len(symbol) >= 2 and symbol in tweet_lower:
+            score, match_type, matched_word = 5.0, "推文包含symbol", symbol
+        elif score == 0:
+            m, word, mtype, sc = match_name_in_tweet(name, tweet_lower)
+            if m:
+                score, match_type, matched_word = sc, mtype, word
+        if score >= (MIN_MATCH_SCORE if source == 'new' else 1.5):
+            matched.append((token['tokenAddress'], score, match_type, matched_word))
+            if local_cache is not None and symbol:
+                local_cache.add(symbol)
+    matched.sort(key=lambda x: x[1], reverse=True)
+    return matched
+
+
+def random_word():
+    return "".join(random.choices(SYLLABLES, k=random.randint(2, 4)))
+
+
+def make_tokens(n):
+    """生成名称、symbol 基本不重复的代币（约 20% 中文名）"""
+    tokens = []
+    for i in range(n):
+        if random.random() < 0.2:
+            name = "".join(random.choices(HANZI, k=random.randint(3, 5)))
+            symbol = name if random.random() < 0.5 else \
+                "".join(random.choices(string.ascii_uppercase, k=4)) + str(i)
+        else:
+            name = " ".join(random_word() for _ in range(random.randint(1, 2)))
+            symbol = "".join(random.choices(string.ascii_uppercase, k=3)) + str(i)
+        tokens.append({'tokenAddress': f"0x{i:040x}", 'tokenSymbol': symbol, 'tokenName': name.title()})
+    return tokens
+
+
+def make_tweets(tokens, n):
+    """每条推文由无关词组成，约一半提及 1~2 个代币"""
+    tweets = []
+    for _ in range(n):
+        parts = random.sample(FILLER, 8)
+        if random.random() < 0.5:
+            for t in random.sample(tokens, random.randint(1, 2)):
+                parts.append(random.choice([t['tokenSymbol'], t['tokenName']]))
+        random.shuffle(parts)
+        tweets.append(" ".join(parts) + " to the moon!")
+    return tweets
+
+
+def run_benchmark():
+    print("\n" + "="*40)
+    print("⚙️ Hardcoded Engine Benchmark (scan vs Aho-Corasick)")
+    print("="*40)
+    random.seed(42)
+
+    for count in TOKEN_COUNTS:
+        tokens = make_tokens(count)
+        tweets = make_tweets(tokens, TWEET_COUNT)
+        print(f"\n[{count} tokens, {TWEET_COUNT} tweets]")
+
+        start = time.time()
+        index = HardcodedIndex(tokens)
+        build_time = time.time() - start
+
+        start = time.time()
+        expected = [reference_engine(tweet, tokens, set()) for tweet in tweets]
+        scan_time = time.time() - start
+
+        start = time.time()
+        results = [run_hardcoded_engine(tweet, index, set()) for tweet in tweets]
+        index_time = time.time() - start
+
+        actual = [[(m['tokenAddress'], m['_match_score'], m['_match_type'], m['_matched_keyword']) for m in r]
+                  for r in results]
+        mismatches = sum(1 for a, e in zip(actual, expected) if a != e)
+        hits = sum(len(r) for r in expected)
+
+        print(f"Index build: {build_time*1000:.1f}ms")
+        print(f"Scan:  {scan_time/len(tweets)*1000:.3f}ms/tweet")
+        print(f"Index: {index_time/len(tweets)*1000:.3f}ms/tweet (x{scan_time/max(index_time, 1e-9):.1f})")
+        print(f"Matches: {hits} | Mismatches: {mismatches}")
+        if mismatches == 0:
+            print("Status: PASS ✅")
+        else:
+            print("Status: FAIL ❌")
+
+
+if __name__ == "__main__":
+    run_benchmark()
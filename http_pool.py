@@ -0,0 +1,68 @@
+"""
+上游 HTTP 连接池
+- 每个上游 (Binance / DexScreener) 共用一个 keep-alive Session
+- 复用 TCP 连接、代理 CONNECT 隧道和 TLS 会话，热路径请求省去握手往返
+- 统计新建连接（握手）和复用次数，供各服务 /status 展示
+"""
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+# 每个上游的连接池大小（同一主机最多保持的空闲连接数）
+POOL_SIZES = {
+    'binance': 10,
+    'dexscreener': 10,
+}
+DEFAULT_POOL_SIZE = 4
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(upstream):
+    """获取指定上游的共享 Session（首次调用时创建）"""
+    session = _sessions.get(upstream)
+    if session is not None:
+        return session
+    with _sessions_lock:
+        session = _sessions.get(upstream)
+        if session is None:
+            pool_size = POOL_SIZES.get(upstream, DEFAULT_POOL_SIZE)
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+            session = requests.Session()
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers['Connection'] = 'keep-alive'
+            _sessions[upstream] = session
+    return session
+
+
+def _iter_pools(adapter):
+    """遍历适配器下的所有 urllib3 连接池（直连 + 经代理）"""
+    managers = [adapter.poolmanager] + list(adapter.proxy_manager.values())
+    for manager in managers:
+        if manager is None:
+            continue
+        for key in list(manager.pools.keys()):
+            pool = manager.pools.get(key)
+            if pool is not None:
+                yield pool
+
+
+def get_pool_stats():
+    """返回各上游的请求数、新建连接数（握手）和连接复用数"""
+    result = {}
+    for upstream, session in list(_sessions.items()):
+        total_requests = 0
+        handshakes = 0
+        for adapter in {id(a): a for a in session.adapters.values()}.values():
+            for pool in _iter_pools(adapter):
+                total_requests += pool.num_requests
+                handshakes += pool.num_connections
+        result[upstream] = {
+            'pool_size': POOL_SIZES.get(upstream, DEFAULT_POOL_SIZE),
+            'requests': total_requests,
+            'handshakes': handshakes,
+            'reused': max(0, total_requests - handshakes),
+        }
+    return result
@@ -13,9 +13,10 @@ import requests
 from concurrent.futures import ThreadPoolExecutor
 from flask import Flask, jsonify, request
 import config
+import http_pool
 
 from .state import (
-    stats, token_list, token_lock, MAX_TOKENS,
+    stats, token_cache,
     pending_news, pending_lock,
     recent_matches, recent_attempts, recent_errors, recent_filtered, log_lock,
     matched_token_names, matched_names_lock,
@@ -29,10 +30,12 @@ from .blacklist import (
 )
 from .matchers import (
     match_new_tokens, match_exclusive_tokens,
-    refresh_exclusive_tokens, get_exclusive_tokens, search_binance_tokens
+    refresh_exclusive_tokens, get_exclusive_tokens, get_exclusive_index, search_binance_tokens,
+    schedule_exclusive_index_rebuild, exclusive_index_builder, exclusive_index_stats
 )
 from .ai_clients import extract_keywords, warm_up_ai_clients
 from .utils import load_seen_events, save_seen_events, get_cached_image
+from .token_record import NormalizedToken
 from .orchestrator import MatchOrchestrator
 
 def send_to_trade_service(news_data, matched_tokens):
@@ -209,20 +212,14 @@ def process_news_item(news_data, full_content, all_images):
     log_attempt(author, content, [], 0, 0, [], event_type, ref_author, ref_author_name)
 
     try:
-        # 1. 准备新币列表
-        with token_lock:
-            current_tokens = list(token_list)
+        # 1. 准备新币列表（只取推文时间窗口内的代币）
+        window_tokens = token_cache.window(news_time * 1000, config.TIME_WINDOW_MS)
         
         # 2. 准备老币列表 (专属列表)
-        exclusive_tokens = get_exclusive_tokens()
-        filtered_exclusive = []
-        if exclusive_tokens:
-            blacklist = load_exclusive_blacklist()
-            blacklist_lower = [b.lower() for b in blacklist]
-            filtered_exclusive = [t for t in exclusive_tokens if t.get('tokenAddress', '').lower() not in blacklist_lower]
+        filtered_exclusive = get_exclusive_index()
 
         # 3. 启动统一撮合逻辑 (新币 + 老币)
-        orchestrator.handle_news(news_data, tweet_text, all_images, current_tokens, filtered_exclusive)
+        orchestrator.handle_news(news_data, tweet_text, all_images, window_tokens, filtered_exclusive)
 
     except Exception as e:
         log_error(f"处理推文异常: {e}")
@@ -231,24 +228,24 @@ def process_news_item(news_data, full_content, all_images):
 def fetch_token_stream():
     """监听代币流"""
     print("监听代币流...", flush=True)
+    last_event_id = None  # 断线重连时通过 Last-Event-ID 只补发缺失的代币
     while stats['running']:
         try:
-            resp = requests.get(f"{config.get_service_url('token')}/stream", stream=True, timeout=(5, None), proxies={'http': None, 'https': None})
+            headers = {'Last-Event-ID': last_event_id} if last_event_id else {}
+            resp = requests.get(f"{config.get_service_url('token')}/stream", stream=True, timeout=(5, None), headers=headers, proxies={'http': None, 'https': None})
             for line in resp.iter_lines():
                 if line:
                     line = line.decode('utf-8')
-                    if line.startswith('data:'):
-                        data = json.loads(line[5:].strip())
-                        with token_lock:
-                            exists = any(t.get('tokenAddress') == data.get('tokenAddress') for t in token_list)
-                            if not exists:
-                                token_list.append(data)
-                                if len(token_list) > MAX_TOKENS:
-                                    token_list.pop(0)
-                                # 触发 Orchestrator 增量匹配
-                                orchestrator.handle_token(data)
-                            else:
-                                print(f"[Match] 代币已存在 (去重): {data.get('tokenSymbol')} - {data.get('tokenAddress')}", flush=True)
+                    if line.startswith('id:'):
+                        last_event_id = line[3:].strip()
+                    elif line.startswith('data:'):
+                        # 入库时构建一次规范化记录，各匹配引擎直接读取预计算字段
+                        data = NormalizedToken(json.loads(line[5:].strip()))
+                        if token_cache.add(data):
+                            # 触发 Orchestrator 增量匹配
+                            orchestrator.handle_token(data)
+                        else:
+                            print(f"[Match] 代币已存在 (去重): {data.get('tokenSymbol')} - {data.get('tokenAddress')}", flush=True)
         except Exception as e:
             log_error(f"代币流: {e}")
             time.sleep(2)
@@ -260,13 +257,17 @@ def fetch_news_stream():
     seen_events = load_seen_events()
     last_save_time = time.time()
 
+    last_event_id = None  # 断线重连时通过 Last-Event-ID 只补发缺失的推文
     while stats['running']:
         try:
-            resp = requests.get(f"{config.get_service_url('news')}/stream", stream=True, timeout=60, proxies={'http': None, 'https': None})
+            headers = {'Last-Event-ID': last_event_id} if last_event_id else {}
+            resp = requests.get(f"{config.get_service_url('news')}/stream", stream=True, timeout=60, headers=headers, proxies={'http': None, 'https': None})
             for line in resp.iter_lines():
                 if line:
                     line = line.decode('utf-8')
-                    if line.startswith('data:'):
+                    if line.startswith('id:'):
+                        last_event_id = line[3:].strip()
+                    elif line.startswith('data:'):
                         data = json.loads(line[5:].strip())
                         stats['total_news'] += 1
 
@@ -311,6 +312,7 @@ def fetch_news_stream():
                             'refAvatar': data.get('refAvatar', ''),
                             'refContent': ref_content,
                             'refImages': ref_images,
+                            'whitelisted': bool(data.get('whitelisted')),  # 白名单作者推文（/status 统计待匹配的白名单会话）
                         }
 
                         buffer_news(news_data)
@@ -348,11 +350,15 @@ def status():
         'running': stats['running'],
         'total_matches': stats['total_matches'],
         'total_news': stats['total_news'],
-        'tokens_cached': len(token_list),
+        'tokens_cached': len(token_cache),
+        'token_cache': token_cache.get_stats(),
+        'exclusive_index': exclusive_index_stats,
         'active_monitoring_sessions': len(active_sessions),
+        'whitelisted_sessions': orchestrator.count_whitelisted_sessions(),
         'last_match': stats['last_match'],
         'errors': stats['errors'],
-        'enable_hardcoded_match': stats['enable_hardcoded_match']
+        'enable_hardcoded_match': stats['enable_hardcoded_match'],
+        'http_pool': http_pool.get_pool_stats(),
     })
 
 
@@ -446,6 +452,7 @@ def api_add_exclusive_blacklist():
     data = request.json
     address = data.get('address', '')
     if add_to_exclusive_blacklist(address):
+        schedule_exclusive_index_rebuild()
         return jsonify({'success': True, 'blacklist': load_exclusive_blacklist()})
     return jsonify({'success': False, 'error': '添加失败或已存在'}), 400
 
@@ -455,6 +462,7 @@ def api_remove_exclusive_blacklist():
     data = request.json
     address = data.get('address', '')
     if remove_from_exclusive_blacklist(address):
+        schedule_exclusive_index_rebuild()
         return jsonify({'success': True, 'blacklist': load_exclusive_blacklist()})
     return jsonify({'success': False, 'error': '移除失败或不存在'}), 400
 
@@ -475,6 +483,7 @@ def run():
     threading.Thread(target=fetch_token_stream, daemon=True).start()
     threading.Thread(target=fetch_news_stream, daemon=True).start()
     threading.Thread(target=exclusive_tokens_updater, daemon=True).start()
+    threading.Thread(target=exclusive_index_builder, daemon=True).start()
     threading.Thread(target=warm_up_ai_clients, daemon=True).start()
 
     print(f"[Match Service] 启动在端口 {config.MATCH_PORT}", flush=True)
@@ -9,6 +9,7 @@ import requests
 import config
 from .blacklist import build_blacklist_prompt
 from .state import log_error
+from .token_record import as_record
 
 # 全局会话对象，用于复用 TCP/SSL 连接
 session = requests.Session()
@@ -247,7 +248,7 @@ def call_gemini_judge(tweet_text, tokens, image_paths=None):
     try:
         from google.genai import types
 
-        token_list_str = [f"{i+1}. symbol:{t['symbol']} name:{t['name']}" for i, t in enumerate(tokens)]
+        token_list_str = [f"{i+1}. {as_record(t).prompt_line}" for i, t in enumerate(tokens)]
         token_str = "\n".join(token_list_str)
 
         has_images = image_paths and len(image_paths) > 0
@@ -303,7 +304,7 @@ def call_gemini_judge(tweet_text, tokens, image_paths=None):
             idx = int(result.replace('.', '').strip()) - 1
             if 0 <= idx < len(tokens):
                 matched = tokens[idx]
-                print(f"[Gemini Judge] OK {time.time()-start:.1f}s -> {matched.get('symbol', '')}", flush=True)
+                print(f"[Gemini Judge] OK {time.time()-start:.1f}s -> {as_record(matched).symbol}", flush=True)
                 return idx
         except ValueError:
             pass
@@ -327,7 +328,7 @@ def call_cerebras_fast_judge(tweet_text, tokens):
     if not hasattr(config, 'CEREBRAS_API_KEY') or not config.CEREBRAS_API_KEY or not tokens:
         return []
 
-    token_list_str = [f"{i+1}. symbol:{t['symbol']} name:{t['name']}" for i, t in enumerate(tokens)]
+    token_list_str = [f"{i+1}. {as_record(t).prompt_line}" for i, t in enumerate(tokens)]
     token_str = "\n".join(token_list_str)
 
     prompt = f"""判断以下推文是否在提及代币列表中的某个代币。
@@ -379,7 +380,7 @@ def call_cerebras_fast_judge(tweet_text, tokens):
                 except ValueError:
                     continue
 
-            matched_symbols = [tokens[i].get('symbol', '') for i in matched_indices]
+            matched_symbols = [as_record(tokens[i]).symbol for i in matched_indices]
             print(f"[Cerebras] OK {time.time()-start:.1f}s -> {matched_symbols}", flush=True)
             return matched_indices
         print(f"[Cerebras] HTTP {resp.status_code}", flush=True)
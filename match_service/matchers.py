@@ -5,112 +5,129 @@
 - 硬编码匹配 + AI匹配并行
 """
 import time
+import threading
 import requests
 from concurrent.futures import ThreadPoolExecutor
 import config
+import http_pool
 
 from .state import (
-    stats, token_list, token_lock,
+    stats, token_cache,
     matched_token_names, matched_names_lock,
     tweet_matched_cache, tweet_cache_lock,
     exclusive_tokens_cache, log_error
 )
 from .blacklist import load_exclusive_blacklist
-from .utils import match_name_in_tweet, get_cached_image
+from .utils import get_cached_image
+from .pattern_index import HardcodedIndex
+from .token_record import NormalizedToken, as_record
 from .ai_clients import call_gemini_judge, call_cerebras_fast_judge
 
 MIN_MATCH_SCORE = 2.0
 
 
+# 优质 / Alpha 列表由 token_service 统一缓存，这里只做条件请求（未变化时返回 304）
+exclusive_lists = {'exclusive': [], 'alpha': []}
+exclusive_list_etags = {}
+
+
+def fetch_token_service_list(name):
+    """从 token_service 拉取列表，返回是否有变化"""
+    headers = {}
+    if exclusive_list_etags.get(name):
+        headers['If-None-Match'] = exclusive_list_etags[name]
+    resp = requests.get(f"{config.get_service_url('token')}/{name}", headers=headers, timeout=10,
+                        proxies={'http': None, 'https': None})
+    if resp.status_code == 304:
+        return False
+    if resp.status_code != 200:
+        raise RuntimeError(f"HTTP {resp.status_code}")
+    exclusive_lists[name] = resp.json().get('items', []) or []
+    exclusive_list_etags[name] = resp.headers.get('ETag')
+    return True
+
+
 def refresh_exclusive_tokens():
     """刷新优质代币缓存（包含优质代币 + Alpha代币）"""
-    global exclusive_tokens_cache
-    headers = {
-        'accept': '*/*',
-        'content-type': 'application/json',
-        'clienttype': 'web',
-        'lang': 'en',
-        'user-agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-    }
+    changed = False
+    for name, label in (('exclusive', '优质代币'), ('alpha', 'Alpha代币')):
+        try:
+            if fetch_token_service_list(name):
+                changed = True
+                print(f"[{label}] 获取 {len(exclusive_lists[name])} 个", flush=True)
+        except Exception as e:
+            print(f"[{label}] 获取失败: {e}", flush=True)
+    if not changed:
+        return
+
     result = []
     seen_addresses = set()
-
-    # 1. 获取优质代币
-    try:
-        resp = requests.get(
-            'https://web3.binance.com/bapi/defi/v1/public/wallet-direct/buw/wallet/market/token/pulse/exclusive/rank/list?chainId=56',
-            headers=headers,
-            proxies=config.PROXIES,
-            timeout=10
-        )
-        if resp.status_code == 200:
-            data = resp.json()
-            tokens = data.get('data', {}).get('tokens', []) or []
-            for t in tokens:
-                addr = t.get('contractAddress', '').lower()
-                if addr and addr not in seen_addresses:
-                    seen_addresses.add(addr)
-                    meta = t.get('metaInfo', {}) or {}
-                    result.append({
-                        'tokenAddress': t.get('contractAddress', ''),
-                        'tokenSymbol': t.get('symbol', ''),
-                        'tokenName': meta.get('name', '') or t.get('symbol', ''),
-                        'chain': 'BSC',
-                        'marketCap': float(t.get('marketCap', 0) or 0),
-                        'holders': int(t.get('holders', 0) or 0),
-                        'liquidity': float(t.get('liquidity', 0) or 0),
-                        'price': t.get('price', 0),
-                        'source': 'exclusive'
-                    })
-            print(f"[优质代币] 获取 {len(result)} 个", flush=True)
-    except Exception as e:
-        print(f"[优质代币] 获取失败: {e}", flush=True)
-
-    # 2. 获取 Alpha 代币
-    alpha_count = 0
-    try:
-        resp = requests.get(
-            'https://web3.binance.com/bapi/defi/v1/public/wallet-direct/buw/wallet/market/token/pulse/exclusive/in/alpha/token/list',
-            headers=headers,
-            proxies=config.PROXIES,
-            timeout=10
-        )
-        if resp.status_code == 200:
-            data = resp.json()
-            # API 返回格式: data 可能是列表或字典
-            raw_data = data.get('data', [])
-            if isinstance(raw_data, list):
-                tokens = raw_data
-            elif isinstance(raw_data, dict):
-                tokens = raw_data.get('tokens', []) or []
-            else:
-                tokens = []
-            for t in tokens:
-                addr = t.get('contractAddress', '').lower()
-                if addr and addr not in seen_addresses:
-                    seen_addresses.add(addr)
-                    meta = t.get('metaInfo', {}) or {}
-                    result.append({
-                        'tokenAddress': t.get('contractAddress', ''),
-                        'tokenSymbol': t.get('symbol', ''),
-                        'tokenName': meta.get('name', '') or t.get('symbol', ''),
-                        'chain': 'BSC',
-                        'marketCap': float(t.get('marketCap', 0) or 0),
-                        'holders': int(t.get('holders', 0) or 0),
-                        'liquidity': float(t.get('liquidity', 0) or 0),
-                        'price': t.get('price', 0),
-                        'source': 'alpha'
-                    })
-                    alpha_count += 1
-            print(f"[Alpha代币] 获取 {alpha_count} 个", flush=True)
-    except Exception as e:
-        print(f"[Alpha代币] 获取失败: {e}", flush=True)
+    for source in ('exclusive', 'alpha'):
+        for t in exclusive_lists[source]:
+            addr = t.get('address', '').lower()
+            if addr and addr not in seen_addresses:
+                seen_addresses.add(addr)
+                result.append(NormalizedToken({
+                    'tokenAddress': t.get('address', ''),
+                    'tokenSymbol': t.get('symbol', ''),
+                    'tokenName': t.get('name', '') or t.get('symbol', ''),
+                    'chain': 'BSC',
+                    'marketCap': float(t.get('marketCap', 0) or 0),
+                    'holders': int(t.get('holders', 0) or 0),
+                    'liquidity': float(t.get('liquidity', 0) or 0),
+                    'price': t.get('price', 0),
+                    'source': source
+                }))
 
     from . import state
     state.exclusive_tokens_cache = result
+    schedule_exclusive_index_rebuild()
     print(f"[优质+Alpha] 缓存总计 {len(result)} 个代币", flush=True)
 
 
+# 优质代币（已过滤黑名单）的硬编码索引，双缓冲：后台线程构建新索引后整体替换引用
+# 推文处理只读取当前索引，不等待重建；重建期间继续使用旧索引
+exclusive_index = HardcodedIndex([])
+exclusive_index_dirty = threading.Event()
+exclusive_index_stats = {'builds': 0, 'size': 0, 'last_build_ms': 0, 'built_at': None}
+
+
+def schedule_exclusive_index_rebuild():
+    """标记优质代币索引需要重建（列表刷新或合约黑名单变化时调用），连续多次标记只重建一次"""
+    exclusive_index_dirty.set()
+
+
+def rebuild_exclusive_index():
+    """按当前优质代币列表和合约黑名单构建新索引并替换"""
+    global exclusive_index
+    from . import state
+    start = time.time()
+    blacklist = {b.lower() for b in load_exclusive_blacklist()}
+    filtered = [t for t in state.exclusive_tokens_cache if as_record(t).address_lower not in blacklist]
+    index = HardcodedIndex(filtered)
+    exclusive_index = index  # 引用赋值是原子的，读取方要么拿到旧索引要么拿到新索引
+    exclusive_index_stats['builds'] += 1
+    exclusive_index_stats['size'] = len(index)
+    exclusive_index_stats['last_build_ms'] = int((time.time() - start) * 1000)
+    exclusive_index_stats['built_at'] = time.time()
+
+
+def exclusive_index_builder():
+    """后台线程：有重建标记时重建优质代币索引"""
+    while stats['running']:
+        exclusive_index_dirty.wait()
+        exclusive_index_dirty.clear()
+        try:
+            rebuild_exclusive_index()
+        except Exception as e:
+            log_error(f"优质代币索引重建: {e}")
+
+
+def get_exclusive_index():
+    """返回过滤黑名单后的优质代币索引（HardcodedIndex，可当作代币列表使用）"""
+    return exclusive_index
+
+
 def get_exclusive_tokens():
     """获取优质代币列表"""
     from . import state
@@ -121,7 +138,7 @@ def search_binance_tokens(keyword):
     """使用 Binance API 搜索代币"""
     try:
         url = f"{config.BINANCE_SEARCH_URL}?keyword={requests.utils.quote(keyword)}&chainIds={config.BINANCE_SEARCH_CHAINS}"
-        resp = requests.get(
+        resp = http_pool.get_session('binance').get(
             url,
             headers=config.HEADERS,
             cookies=config.COOKIES,
@@ -152,7 +169,7 @@ def search_binance_tokens(keyword):
             if (mcap >= min_mcap and
                 liquidity >= config.SEARCH_MIN_LIQUIDITY and
                 age_seconds >= config.SEARCH_MIN_AGE_SECONDS):
-                quality_tokens.append({
+                quality_tokens.append(NormalizedToken({
                     'tokenAddress': token.get('contractAddress', ''),
                     'tokenSymbol': token.get('symbol', ''),
                     'tokenName': token.get('name', ''),
@@ -161,7 +178,7 @@ def search_binance_tokens(keyword):
                     'liquidity': liquidity,
                     'price': token.get('price', 0),
                     'source': 'binance_search'
-                })
+                }))
 
         return quality_tokens
     except Exception as e:
@@ -170,28 +187,14 @@ def search_binance_tokens(keyword):
 
 
 def run_hardcoded_engine(tweet_text, tokens, local_cache=None, source='new'):
-    """仅执行硬编码匹配逻辑 (无IO，无并发)"""
+    """仅执行硬编码匹配逻辑 (无IO，无并发)
+    tokens 可以是代币列表或预先构建的 HardcodedIndex（自动机一次扫描推文，只对命中的代币打分）
+    传入列表时逐个检查，不在推文处理路径上构建自动机"""
     matched = []
     tweet_lower = tweet_text.lower()
-    
-    for token in tokens:
-        symbol = (token.get('tokenSymbol') or token.get('symbol') or '').lower()
-        name = (token.get('tokenName') or token.get('name') or '').lower()
-        score, match_type, matched_word = 0, None, None
-
-        # 缓存命中（同一条推文内）
-        if local_cache is not None and symbol and symbol in local_cache:
-            score, match_type, matched_word = 5.0, "缓存命中", symbol
-
-        # symbol 在推文中
-        if score == 0 and symbol and len(symbol) >= 2 and symbol in tweet_lower:
-            score, match_type, matched_word = 5.0, "推文包含symbol", symbol
-        # name 匹配
-        elif score == 0:
-            m, word, mtype, sc = match_name_in_tweet(name, tweet_lower)
-            if m:
-                score, match_type, matched_word = sc, mtype, word
+    index = tokens if isinstance(tokens, HardcodedIndex) else HardcodedIndex(tokens, automaton=False)
 
+    for token, score, match_type, matched_word, symbol in index.scan(tweet_lower, local_cache):
         if score >= (MIN_MATCH_SCORE if source == 'new' else 1.5):
             token_copy = token.copy()
             token_copy['_match_score'] = score
@@ -228,19 +231,16 @@ def run_ai_engine(tweet_text, tokens, image_urls=None, local_cache=None, source=
             if path:
                 image_paths.append(path)
 
-    # 转换格式供 AI 使用
-    tokens_for_ai = [
-        {'symbol': t.get('tokenSymbol') or t.get('symbol', ''),
-         'name': t.get('tokenName') or t.get('name', '')}
-        for t in tokens
-    ]
+    # 规范化记录自带 AI 提示词行（入库时已构建）
+    records = [as_record(t) for t in tokens]
 
     try:
-        idx = call_gemini_judge(tweet_text, tokens_for_ai, image_paths)
-        if 0 <= idx < len(tokens):
-            token_copy = tokens[idx].copy()
+        idx = call_gemini_judge(tweet_text, records, image_paths)
+        if 0 <= idx < len(records):
+            record = records[idx]
+            token_copy = record.copy()
             token_copy['_match_score'] = 5.0
-            token_copy['_matched_keyword'] = token_copy.get('tokenSymbol') or token_copy.get('symbol', '')
+            token_copy['_matched_keyword'] = record.symbol
             token_copy['_match_type'] = 'ai_match'
             token_copy['_match_method'] = 'ai'
             token_copy['_token_source'] = source
@@ -252,10 +252,8 @@ def run_ai_engine(tweet_text, tokens, image_urls=None, local_cache=None, source=
                 token_copy['_match_time_cost'] = 0
                 
             # 加入缓存
-            if local_cache is not None:
-                symbol = (token_copy.get('tokenSymbol') or token_copy.get('symbol') or '').lower()
-                if symbol:
-                    local_cache.add(symbol)
+            if local_cache is not None and record.symbol_lower:
+                local_cache.add(record.symbol_lower)
 
             return [token_copy]
     except Exception as e:
@@ -267,25 +265,22 @@ def run_ai_fast_engine(tweet_text, tokens, local_cache=None, source='new'):
     if not tokens or not config.CEREBRAS_API_KEY:
         return []
 
-    # 转换格式供 AI 使用
-    tokens_for_ai = [
-        {'symbol': t.get('tokenSymbol') or t.get('symbol', ''),
-         'name': t.get('tokenName') or t.get('name', '')}
-        for t in tokens
-    ]
+    # 规范化记录自带 AI 提示词行（入库时已构建）
+    records = [as_record(t) for t in tokens]
 
     try:
         # 调用 Cerebras 快速匹配
-        matched_indices = call_cerebras_fast_judge(tweet_text, tokens_for_ai)
+        matched_indices = call_cerebras_fast_judge(tweet_text, records)
         if not matched_indices:
             return []
 
         matched = []
         for idx in matched_indices:
-            if 0 <= idx < len(tokens):
-                token_copy = tokens[idx].copy()
+            if 0 <= idx < len(records):
+                record = records[idx]
+                token_copy = record.copy()
                 token_copy['_match_score'] = 4.5  # 略低于 Gemini
-                token_copy['_matched_keyword'] = token_copy.get('tokenSymbol') or token_copy.get('symbol', '')
+                token_copy['_matched_keyword'] = record.symbol
                 token_copy['_match_type'] = 'ai_fast_match'
                 token_copy['_match_method'] = 'ai_fast'
                 token_copy['_token_source'] = source
@@ -297,10 +292,8 @@ def run_ai_fast_engine(tweet_text, tokens, local_cache=None, source='new'):
                     token_copy['_match_time_cost'] = 0
 
                 # 加入缓存
-                if local_cache is not None:
-                    symbol = (token_copy.get('tokenSymbol') or token_copy.get('symbol') or '').lower()
-                    if symbol:
-                        local_cache.add(symbol)
+                if local_cache is not None and record.symbol_lower:
+                    local_cache.add(record.symbol_lower)
 
                 matched.append(token_copy)
 
@@ -328,14 +321,9 @@ def match_new_tokens(news_time, tweet_text, image_urls=None, tweet_id=None):
     window_tokens = []
     window_token_names = []
 
-    with token_lock:
-        for token in token_list:
-            create_time = token.get('createTime', 0)
-            if not create_time:
-                continue
-            if abs(create_time - news_time_ms) <= config.TIME_WINDOW_MS:
-                window_tokens.append(token)
-                window_token_names.append(token.get('tokenSymbol') or token.get('tokenName') or 'Unknown')
+    for token in token_cache.window(news_time_ms, config.TIME_WINDOW_MS):
+        window_tokens.append(token)
+        window_token_names.append(token.get('tokenSymbol') or token.get('tokenName') or 'Unknown')
 
     if not window_tokens:
         return [], 0, []
@@ -356,16 +344,8 @@ def match_exclusive_tokens(tweet_text, image_urls=None):
     if not tweet_text:
         return []
 
-    all_tokens = get_exclusive_tokens()
-    if not all_tokens:
-        return []
-
     # 过滤黑名单（支持新币的 tokenAddress 和老币的 address 字段）
-    blacklist = load_exclusive_blacklist()
-    blacklist_lower = [b.lower() for b in blacklist]
-    tokens = [t for t in all_tokens 
-              if (t.get('tokenAddress', '') or t.get('address', '')).lower() not in blacklist_lower]
-
+    tokens = get_exclusive_index()
     if not tokens:
         return []
 
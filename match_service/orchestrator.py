@@ -22,6 +22,7 @@ class NewsSession:
         self.lock = threading.Lock()
         
         self.author = news_data.get('author', '')
+        self.whitelisted = bool(news_data.get('whitelisted'))  # 白名单作者推文（代币服务据此调频）
         self.tweet_id = f"{self.news_time}_{self.author}"
 
     def get_remaining_seconds(self, current_time):
@@ -157,8 +158,9 @@ class MatchOrchestrator:
         # 定时清理过期会话
         threading.Thread(target=self._cleanup_loop, daemon=True).start()
 
-    def handle_news(self, news_data, full_content, all_images, existing_tokens, exclusive_tokens=None):
-        """处理新推文：创建会话并进行三引擎并行匹配（全收策略）"""
+    def handle_news(self, news_data, full_content, all_images, window_tokens, exclusive_tokens=None):
+        """处理新推文：创建会话并进行三引擎并行匹配（全收策略）
+        window_tokens 为调用方按时间索引取出的窗口内新币"""
         session = NewsSession(news_data, full_content, all_images, self)
         tweet_id = session.tweet_id
 
@@ -166,7 +168,6 @@ class MatchOrchestrator:
             self.sessions[tweet_id] = session
 
         # 1. 处理新币 (原有逻辑)
-        window_tokens = [t for t in existing_tokens if session.is_in_window(t.get('createTime', 0))]
         if window_tokens:
             # 三引擎并行执行（新币）
             initial_new_matches = session.match_token_list(window_tokens, source='new')
@@ -243,6 +244,12 @@ class MatchOrchestrator:
         except Exception as e:
             log_error(f"Orchestrator AI Fast Task: {e}")
 
+    def count_whitelisted_sessions(self):
+        """仍在时间窗口内等待新币的白名单推文会话数"""
+        now = time.time()
+        with self.sessions_lock:
+            return sum(1 for s in self.sessions.values() if s.whitelisted and s.is_active(now))
+
     def get_active_sessions_info(self):
         """获取当前活跃会话的详细信息（符合用户要求的特定格式）"""
         now = time.time()
@@ -0,0 +1,155 @@
+"""
+硬编码匹配的多模式索引
+- 所有代币的 symbol、完整 name、name 分词编译成一个 Aho-Corasick 自动机
+- 每条推文只扫描一遍，得到命中的模式，再只对命中的代币打分
+- 打分规则与逐个代币检查完全一致（缓存命中 > symbol > name > name 分词）
+"""
+from collections import deque
+
+from .token_record import as_record
+
+# 代币数少于该值时直接逐个做子串检查，构建自动机不划算
+AUTOMATON_MIN_TOKENS = 16
+
+
+class AhoCorasick:
+    """Aho-Corasick 多模式匹配自动机"""
+
+    def __init__(self, patterns=()):
+        self._goto = [{}]      # 状态 -> {字符: 下一状态}
+        self._fail = [0]
+        self._output = [None]  # 状态 -> 以该状态结尾的模式
+        self._dict_link = [0]  # 状态 -> 失败链上最近的有输出状态（0 表示无）
+        for pattern in patterns:
+            self.add(pattern)
+        self.build()
+
+    def add(self, pattern):
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(None)
+                self._dict_link.append(0)
+            state = nxt
+        self._output[state] = pattern
+
+    def build(self):
+        """按 BFS 计算失败指针和输出链"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                f = self._goto[f].get(ch, 0)
+                self._fail[nxt] = f
+                self._dict_link[nxt] = f if self._output[f] is not None else self._dict_link[f]
+
+    def find_all(self, text):
+        """返回 text 中出现过的所有模式（集合）"""
+        goto, fail, output, dict_link = self._goto, self._fail, self._output, self._dict_link
+        found = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            s = state if output[state] is not None else dict_link[state]
+            while s:
+                found.add(output[s])
+                s = dict_link[s]
+        return found
+
+
+def score_patterns(symbol, name, words, contains, local_cache=None):
+    """按硬编码规则打分，返回 (分数, 匹配类型, 匹配词)；contains(模式) 判断推文是否包含该模式"""
+    if local_cache is not None and symbol and symbol in local_cache:
+        return 5.0, "缓存命中", symbol
+    if symbol and len(symbol) >= 2 and contains(symbol):
+        return 5.0, "推文包含symbol", symbol
+    if len(name) >= 2:
+        if contains(name):
+            return 4.0, "推文包含name", name
+        for word in words:
+            if contains(word):
+                return 3.0, "推文包含name分词", word
+    return 0, None, None
+
+
+class HardcodedIndex:
+    """
+    一组代币的硬编码匹配索引
+    - 可当作只读代币列表使用（len / 迭代 / 下标，元素为 NormalizedToken），可直接传给 AI 引擎
+    - 匹配模式直接取自规范化记录，不再逐个代币重新小写和分词
+    - scan() 按原列表顺序产出有分数的代币
+    - 构建后只读，多线程共享安全；列表变化时整体重建新实例再替换引用
+    - automaton=False 时不构建自动机，逐个检查（用于每条推文临时的小列表）
+    """
+
+    def __init__(self, tokens, automaton=True):
+        self.tokens = [as_record(t) for t in tokens]
+        self._patterns = [(t.symbol_lower, t.name_lower, t.words) for t in self.tokens]
+        self._automaton = None
+        if not automaton or len(self.tokens) < AUTOMATON_MIN_TOKENS:
+            return
+        self._by_pattern = {}  # 模式 -> [代币下标]
+        self._by_symbol = {}   # symbol -> [代币下标]，用于同一推文内的缓存命中
+        for i, (symbol, name, words) in enumerate(self._patterns):
+            if symbol:
+                self._by_symbol.setdefault(symbol, []).append(i)
+            keys = set()
+            if len(symbol) >= 2:
+                keys.add(symbol)
+            if len(name) >= 2:
+                keys.add(name)
+                keys.update(words)
+            for key in keys:
+                self._by_pattern.setdefault(key, []).append(i)
+        self._automaton = AhoCorasick(self._by_pattern)
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def __iter__(self):
+        return iter(self.tokens)
+
+    def __getitem__(self, i):
+        return self.tokens[i]
+
+    def _candidates(self, found, local_cache):
+        """可能得分的代币下标（升序）"""
+        candidates = set()
+        for pattern in found:
+            candidates.update(self._by_pattern[pattern])
+        # 命中代币的 symbol 会加入推文缓存，同 symbol 的其他代币随后以"缓存命中"匹配
+        symbols = {self._patterns[i][0] for i in candidates}
+        if local_cache:
+            symbols.update(local_cache)
+        for symbol in symbols:
+            candidates.update(self._by_symbol.get(symbol, ()))
+        return sorted(candidates)
+
+    def scan(self, tweet_lower, local_cache=None):
+        """
+        生成 (代币, 分数, 匹配类型, 匹配词, symbol)
+        调用方在两次迭代之间更新 local_cache，后续代币的缓存命中判断随之生效
+        """
+        if self._automaton is None:
+            contains = tweet_lower.__contains__
+            indexes = range(len(self.tokens))
+        else:
+            found = self._automaton.find_all(tweet_lower)
+            contains = found.__contains__
+            indexes = self._candidates(found, local_cache)
+        for i in indexes:
+            symbol, name, words = self._patterns[i]
+            score, match_type, matched_word = score_patterns(symbol, name, words, contains, local_cache)
+            if score:
+                yield self.tokens[i], score, match_type, matched_word, symbol
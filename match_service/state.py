@@ -7,6 +7,8 @@
 import threading
 import time
 
+from .token_cache import TokenCache
+
 # ==================== 状态统计 ====================
 stats = {
     'total_matches': 0,
@@ -20,9 +22,9 @@ stats = {
 }
 
 # ==================== 代币列表缓存 ====================
-token_list = []
-token_lock = threading.Lock()
-MAX_TOKENS = 500
+# 地址索引去重 + 到达顺序淘汰 + createTime 时间窗口索引
+MAX_TOKENS = 20000
+token_cache = TokenCache(MAX_TOKENS)
 
 # ==================== 日志记录 ====================
 recent_matches = []
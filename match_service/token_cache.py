@@ -0,0 +1,102 @@
+"""
+新币缓存
+- 按地址建字典索引，去重 O(1)
+- 按到达顺序保存在只追加的数组中，超出容量时移动起始下标淘汰最早的代币，O(1)
+- 另按 createTime 维护有序索引，window() 用 bisect 直接取出推文时间窗口内的代币，O(log n + k)
+  新币基本按创建时间到达，插入多为追加；淘汰时只计数不删除（读取时跳过），失效项过半再整体压缩，均摊 O(1)
+"""
+import threading
+from bisect import bisect_left, bisect_right
+
+
+def token_create_time(token):
+    """代币创建时间（毫秒），缺失或非法时为 0"""
+    try:
+        return int(token.get('createTime') or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+class TokenCache:
+    """有界新币缓存（地址索引 + 到达顺序淘汰）"""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._items = []    # 到达顺序，_start 之前的为已淘汰
+        self._start = 0
+        self._index = {}    # tokenAddress -> token
+        self._times = []    # 有序的 createTime（不含缺失创建时间的代币）
+        self._timed = []    # 与 _times 一一对应的代币（可能含已淘汰的失效项）
+        self._dead = 0      # _timed 中失效项数量
+        self._lock = threading.Lock()
+        self.evicted = 0
+        self.duplicates = 0
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, address):
+        return address in self._index
+
+    def get(self, address):
+        return self._index.get(address)
+
+    def add(self, token):
+        """加入新代币，已存在返回 False"""
+        address = token.get('tokenAddress')
+        with self._lock:
+            if address in self._index:
+                self.duplicates += 1
+                return False
+            self._index[address] = token
+            self._items.append(token)
+            create_time = token_create_time(token)
+            if create_time:
+                pos = bisect_right(self._times, create_time)
+                self._times.insert(pos, create_time)
+                self._timed.insert(pos, token)
+            while len(self._items) - self._start > self.max_size:
+                self._evict_oldest()
+            return True
+
+    def _evict_oldest(self):
+        """淘汰最早的代币（调用方持有锁）"""
+        token = self._items[self._start]
+        self._start += 1
+        self.evicted += 1
+        address = token.get('tokenAddress')
+        if self._index.get(address) is token:
+            del self._index[address]
+        if token_create_time(token):
+            self._dead += 1
+            if self._dead > len(self._timed) // 2:
+                self._compact_times()
+        # 已淘汰部分超过一半时压缩数组
+        if self._start > self.max_size:
+            self._items = self._items[self._start:]
+            self._start = 0
+
+    def _is_live(self, token):
+        return self._index.get(token.get('tokenAddress')) is token
+
+    def _compact_times(self):
+        """从时间索引中移除已淘汰的代币（调用方持有锁）"""
+        live = [(t, token) for t, token in zip(self._times, self._timed) if self._is_live(token)]
+        self._times = [t for t, _ in live]
+        self._timed = [token for _, token in live]
+        self._dead = 0
+
+    def window(self, center_ms, half_width_ms):
+        """返回 createTime 在 [center - half_width, center + half_width] 内的代币，按创建时间升序"""
+        with self._lock:
+            lo = bisect_left(self._times, center_ms - half_width_ms)
+            hi = bisect_right(self._times, center_ms + half_width_ms)
+            return [token for token in self._timed[lo:hi] if self._is_live(token)]
+
+    def get_stats(self):
+        return {
+            'size': len(self._index),
+            'max_size': self.max_size,
+            'evicted': self.evicted,
+            'duplicates': self.duplicates,
+        }
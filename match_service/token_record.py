@@ -0,0 +1,36 @@
+"""
+规范化代币记录
+- 代币进入撮合服务时构建一次（新币流 / 优质代币列表 / Binance 搜索）
+- 预先计算规范地址、小写 symbol/name、name 分词和 AI 提示词行，各匹配引擎直接读取
+- 本身仍是代币字典（dict 子类），原有按键读取、copy()、JSON 序列化都不受影响
+"""
+from .utils import tokenize_name, LOW_ENTROPY_WORDS
+
+
+class NormalizedToken(dict):
+    """附带预计算匹配字段的代币字典（构建后不应再修改）"""
+    __slots__ = ('address', 'address_lower', 'symbol', 'name',
+                 'symbol_lower', 'name_lower', 'words', 'prompt_line')
+
+    def __init__(self, token=()):
+        super().__init__(token)
+        self.address = (self.get('tokenAddress') or self.get('address') or '').strip()
+        self.address_lower = self.address.lower()
+        self.symbol = self.get('tokenSymbol') or self.get('symbol') or ''
+        self.name = self.get('tokenName') or self.get('name') or ''
+        self.symbol_lower = self.symbol.lower()
+        self.name_lower = self.name.lower()
+        # 过滤低信息熵词后的 name 分词（去重，保持顺序）
+        words = []
+        if len(self.name_lower) >= 2:
+            for word in tokenize_name(self.name_lower):
+                if word.lower() not in LOW_ENTROPY_WORDS and word not in words:
+                    words.append(word)
+        self.words = tuple(words)
+        # AI 判断提示词中的一行（序号由调用方添加）
+        self.prompt_line = f"symbol:{self.symbol} name:{self.name}"
+
+
+def as_record(token):
+    """返回代币的规范化记录，已是记录时直接返回"""
+    return token if isinstance(token, NormalizedToken) else NormalizedToken(token)
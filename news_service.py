@@ -7,10 +7,16 @@
 import requests
 import time
 import json
+import bisect
+import random
 import threading
 import os
 from flask import Flask, Response, jsonify, request
 import config
+import http_pool
+from event_log import EventLog, format_event_id, parse_last_event_id
+from dedup_index import DedupIndex
+from segment_log import SegmentLog
 
 app = Flask(__name__)
 
@@ -21,13 +27,22 @@ stats = {
     'last_fetch': None,
     'last_success': None,
     'errors': 0,
-    'filtered_by_whitelist': 0
+    'filtered_by_whitelist': 0,
+    'boost_requested': 0,   # 白名单推文触发的调频请求数
+    'boost_sent': 0,        # 实际发送的 /boost 调用数（合并后）
 }
 
-# 去重和新闻列表
-seen_ids = set()
-news_list = []
-news_lock = threading.Lock()
+# 去重和推文日志（有界环形缓冲，订阅者按序号游标读取）
+SEEN_TTL = 3600  # 去重记录保留时间（秒），需覆盖接口的回溯窗口
+seen_ids = DedupIndex(SEEN_TTL)
+NEWS_LOG_CAPACITY = 2000  # 内存中保留的最近推文数
+news_log = EventLog(NEWS_LOG_CAPACITY)
+HEARTBEAT_INTERVAL = 15  # SSE 心跳间隔（秒）
+
+# 推文持久化日志（按小时分段追加写入本地磁盘，供 /replay 回放）
+NEWS_ARCHIVE_DIR = os.path.join(os.path.dirname(__file__), 'news_archive')
+NEWS_ARCHIVE_RETENTION = 7 * 86400  # 保留时间（秒）
+news_archive = SegmentLog(NEWS_ARCHIVE_DIR, 'news', retention_seconds=NEWS_ARCHIVE_RETENTION)
 
 # 错误日志
 error_log = []
@@ -77,24 +92,62 @@ def is_author_in_whitelist(author):
         return author.lower() in author_whitelist
 
 
-def trigger_token_boost(author):
+def trigger_token_boost(author, merged=1):
     """触发 token_service 的高频模式"""
     try:
         resp = requests.post(
             f"{config.get_service_url('token')}/boost",
-            json={'author': author},
+            json={'author': author, 'merged': merged},
             timeout=2,
             proxies={'http': None, 'https': None}
         )
         if resp.status_code == 200:
             result = resp.json()
-            print(f"[智能调频] 已触发高频模式 (作者: @{author})", flush=True)
+            merged_str = f", 合并 {merged} 次" if merged > 1 else ""
+            print(f"[智能调频] 已触发高频模式 (作者: @{author}{merged_str})", flush=True)
             return True
     except Exception as e:
         print(f"[智能调频] 触发失败: {e}", flush=True)
     return False
 
 
+# ==================== 调频分发 ====================
+# 白名单推文只登记调频请求，由后台线程发送 /boost，采集和推送不等待 HTTP
+# 窗口内的多次请求合并为一次调用（高频模式本身持续 60 秒，无需逐条触发）
+BOOST_COALESCE_WINDOW = 5  # 合并窗口（秒）
+boost_pending = []  # 待发送的触发作者
+boost_pending_lock = threading.Lock()
+boost_event = threading.Event()
+
+
+def request_token_boost(author):
+    """登记一次调频请求（非阻塞）"""
+    with boost_pending_lock:
+        boost_pending.append(author)
+        boost_event.set()
+    stats['boost_requested'] += 1
+
+
+def boost_dispatcher():
+    """后台线程：合并调频请求并发送到 token_service"""
+    last_sent = 0
+    while stats['running']:
+        boost_event.wait()
+        # 距上次发送不足一个窗口时等待，期间到达的请求一并合并
+        wait = BOOST_COALESCE_WINDOW - (time.time() - last_sent)
+        if wait > 0:
+            time.sleep(wait)
+        with boost_pending_lock:
+            authors = list(boost_pending)
+            boost_pending.clear()
+            boost_event.clear()
+        if not authors:
+            continue
+        trigger_token_boost(authors[-1], merged=len(authors))
+        stats['boost_sent'] += 1
+        last_sent = time.time()
+
+
 # 启动时加载白名单
 load_whitelist()
 
@@ -116,124 +169,396 @@ payload = {
     "groupIds": ["113213"]
 }
 
+# 监听的 KOL 分组：每个分组独立线程并行轮询，可单独设置间隔（秒）
+# 结果统一去重后写入同一条推文日志
+NEWS_GROUPS = [
+    {'groupId': '113213', 'interval': 1.0, 'hot_interval': 0.5},
+]
+
+
+# ==================== 自适应轮询 ====================
+POLL_INTERVAL = 1.0        # 目标有效轮询间隔（秒，含请求耗时）
+HOT_POLL_INTERVAL = 0.5    # 白名单作者近期活跃时的轮询间隔（秒）
+HOT_DURATION = 120         # 白名单作者发推后保持加速的时间（秒）
+MAX_BACKOFF = 30           # 错误退避上限（秒）
+RATE_LIMIT_BACKOFF = 10    # 被限流 (HTTP 429) 时的起始退避（秒）
+
+
+class PollScheduler:
+    """
+    轮询调度器
+    - 扣除请求耗时，使两次请求的起点间隔接近目标间隔
+    - 连续错误/限流时指数退避并加随机抖动
+    - 白名单作者近期活跃时缩短间隔
+    """
+
+    def __init__(self, interval=POLL_INTERVAL, hot_interval=HOT_POLL_INTERVAL):
+        self.interval = interval
+        self.hot_interval = hot_interval
+        self.consecutive_errors = 0
+        self.rate_limited = False
+        self.hot_until = 0
+        self.last_request_time = 0
+        self.avg_request_time = 0
+        self.last_delay = 0
+
+    def record_request(self, elapsed):
+        """记录一次请求耗时（指数滑动平均）"""
+        self.last_request_time = elapsed
+        self.avg_request_time = elapsed if not self.avg_request_time else self.avg_request_time * 0.9 + elapsed * 0.1
+
+    def record_success(self):
+        self.consecutive_errors = 0
+        self.rate_limited = False
+
+    def record_error(self, rate_limited=False):
+        self.consecutive_errors += 1
+        self.rate_limited = rate_limited
+
+    def mark_hot(self):
+        """白名单作者活跃，进入加速轮询"""
+        self.hot_until = time.time() + HOT_DURATION
+
+    def is_hot(self):
+        return time.time() < self.hot_until
+
+    def current_interval(self):
+        return self.hot_interval if self.is_hot() else self.interval
+
+    def next_delay(self, elapsed):
+        """计算下一次请求前需要等待的秒数"""
+        if self.consecutive_errors:
+            base = RATE_LIMIT_BACKOFF if self.rate_limited else self.interval
+            backoff = min(MAX_BACKOFF, base * (2 ** (self.consecutive_errors - 1)))
+            delay = backoff * random.uniform(0.5, 1.5)
+        else:
+            delay = self.current_interval() - elapsed
+        self.last_delay = max(0, delay)
+        return self.last_delay
+
+    def get_stats(self):
+        return {
+            'interval': self.current_interval(),
+            'hot': self.is_hot(),
+            'consecutive_errors': self.consecutive_errors,
+            'rate_limited': self.rate_limited,
+            'last_request_time': round(self.last_request_time, 3),
+            'avg_request_time': round(self.avg_request_time, 3),
+            'last_delay': round(self.last_delay, 3),
+        }
+
+
+class LatencyHistogram:
+    """推文延迟直方图（eventTime -> 首次获取），固定分桶"""
+    BOUNDS_MS = [250, 500, 1000, 2000, 3000, 5000, 10000, 30000, 60000]
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS_MS) + 1)
+        self.total = 0
+        self.sum_ms = 0
+        self.lock = threading.Lock()
+
+    def record(self, lag_ms):
+        lag_ms = max(0, lag_ms)
+        idx = bisect.bisect_left(self.BOUNDS_MS, lag_ms)
+        with self.lock:
+            self.counts[idx] += 1
+            self.total += 1
+            self.sum_ms += lag_ms
+
+    def _percentile(self, q):
+        """按分桶上界估算分位数（调用方持有锁）"""
+        target = q * self.total
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= target:
+                return self.BOUNDS_MS[i] if i < len(self.BOUNDS_MS) else None
+        return None
+
+    def get_stats(self):
+        with self.lock:
+            labels = [f"<={b}ms" for b in self.BOUNDS_MS] + [f">{self.BOUNDS_MS[-1]}ms"]
+            return {
+                'count': self.total,
+                'avg_ms': int(self.sum_ms / self.total) if self.total else 0,
+                'p50_ms': self._percentile(0.5),
+                'p90_ms': self._percentile(0.9),
+                'p99_ms': self._percentile(0.99),
+                'buckets': dict(zip(labels, self.counts)),
+            }
+
+
+# 每个分组一个调度器 (groupId -> PollScheduler)
+group_schedulers = {
+    g['groupId']: PollScheduler(g.get('interval', POLL_INTERVAL), g.get('hot_interval', HOT_POLL_INTERVAL))
+    for g in NEWS_GROUPS
+}
+group_stats = {g['groupId']: {'last_fetch': None, 'new_items': 0} for g in NEWS_GROUPS}
+detect_latency = LatencyHistogram()
+ingest_lock = threading.Lock()  # 多分组写入推文日志时保证批内按时间顺序连续追加
+
+
+def event_time_ms(event_time):
+    """eventTime 统一为毫秒（接口返回毫秒，注入推文为秒）"""
+    event_time = event_time or 0
+    return event_time * 1000 if event_time < 10000000000 else event_time
 
-def fetch_news():
+
+def fetch_news(group_id, scheduler):
+    """拉取指定分组的推文"""
     try:
-        response = requests.post(
+        response = http_pool.get_session('binance').post(
             config.BINANCE_NEWS_URL,
             headers=config.HEADERS,
             cookies=config.COOKIES,
-            json=payload,
+            json=dict(payload, groupIds=[group_id]),
             proxies=config.PROXIES,
             timeout=10
         )
         if response.status_code == 200:
             data = response.json()
             if data.get('code') not in ['000000', None] and data.get('message'):
-                log_error(f"API: {data.get('message')}")
+                log_error(f"API [{group_id}]: {data.get('message')}")
+                scheduler.record_error()
             else:
                 stats['last_success'] = time.time()
+                scheduler.record_success()
             return data
         else:
-            log_error(f"HTTP {response.status_code}")
+            log_error(f"HTTP [{group_id}] {response.status_code}")
+            scheduler.record_error(rate_limited=response.status_code == 429)
     except Exception as e:
-        log_error(f"请求: {e}")
-        print(f"请求异常: {e}", flush=True)
+        log_error(f"请求 [{group_id}]: {e}")
+        print(f"请求异常 [{group_id}]: {e}", flush=True)
+        scheduler.record_error()
     return None
 
 
-def get_new_items(data):
+def get_new_items(data, record_latency=True):
+    """筛出未见过的推文；record_latency 为 False 时不计入发现延迟"""
     new_items = []
     if not data or 'data' not in data:
         return new_items
 
     items = data.get('data', [])
+    now_ms = int(time.time() * 1000)
     for item in items:
         user = item.get('user', {})
         item_id = f"{item.get('eventTime', '')}_{user.get('handle', '')}_{item.get('eventType', '')}"
-        if item_id not in seen_ids:
-            seen_ids.add(item_id)
+        if not seen_ids.check_and_add(item_id):
             new_items.append(item)
+            # 推文发布到首次获取的延迟
+            if record_latency and item.get('eventTime'):
+                detect_latency.record(now_ms - event_time_ms(item.get('eventTime')))
 
     new_items.sort(key=lambda x: x.get('eventTime', 0))
     return new_items
 
 
-def news_fetcher():
-    print("开始获取推文...", flush=True)
-    while stats['running']:
-        data = fetch_news()
-        stats['last_fetch'] = time.time()
-        new_items = get_new_items(data)
-        if new_items:
-            with news_lock:
-                for item in new_items:
-                    user = item.get('user', {})
-                    author = user.get('handle', 'Unknown')
+class NewsRecord:
+    """
+    推文精简记录（入库时构建一次）
+    - 只保留下游用到的字段，图片/视频已解析为元组，不再持有接口原始 dict
+    - sse: 预编码的 SSE data 帧 (bytes)，所有订阅者共享
+    - /recent 使用的 JSON 首次请求时编码并缓存
+    """
+    __slots__ = (
+        'event_time', 'event_type', 'author', 'author_name', 'avatar', 'content',
+        'images', 'videos', 'ref_author', 'ref_author_name', 'ref_avatar',
+        'ref_content', 'ref_images', 'whitelisted', 'sse', '_recent_json',
+    )
+
+    def __init__(self, event_time, event_type, author, author_name, avatar, content,
+                 images, videos, ref_author, ref_author_name, ref_avatar, ref_content, ref_images,
+                 whitelisted=False):
+        self.event_time = event_time
+        self.event_type = event_type
+        self.author = author
+        self.author_name = author_name
+        self.avatar = avatar
+        self.content = content
+        self.images = images
+        self.videos = videos
+        self.ref_author = ref_author
+        self.ref_author_name = ref_author_name
+        self.ref_avatar = ref_avatar
+        self.ref_content = ref_content
+        self.ref_images = ref_images
+        self.whitelisted = whitelisted  # 作者在白名单中（撮合服务据此统计待匹配的白名单推文）
+        self.sse = f"data: {json.dumps(self.to_event(), ensure_ascii=False)}\n\n".encode('utf-8')
+        self._recent_json = None
+
+    @classmethod
+    def from_api(cls, item):
+        """从接口原始数据构建"""
+        user = item.get('user') or {}
+        ref_user = item.get('referenceUser') or {}
+        event_type = item.get('eventType', '')
+        author = user.get('handle', 'Unknown')
 
-                    # 白名单过滤
-                    if not is_author_allowed(author):
-                        stats['filtered_by_whitelist'] += 1
-                        continue
+        # 原推内容（reply/retweet/quote时）
+        ref_content = ''
+        if event_type in ('reply', 'retweet', 'quote'):
+            ref_content = item.get('contentOld') or ''
 
-                    news_list.append(item)
-                    stats['total_news'] += 1
-                    print(f"[推文] @{author} - {item.get('eventType', '')}", flush=True)
+        return cls(
+            event_time=item.get('eventTime'),
+            event_type=event_type,
+            author=author,
+            author_name=user.get('username', ''),
+            avatar=user.get('profilePic', ''),
+            content=item.get('contentNew') or '',
+            images=tuple(parse_json_field(item.get('fileUrls') or '')),
+            videos=tuple(parse_json_field(item.get('videoUrls') or '')),
+            ref_author=ref_user.get('handle', ''),
+            ref_author_name=ref_user.get('username', ''),
+            ref_avatar=ref_user.get('profilePic', ''),
+            ref_content=ref_content,
+            ref_images=tuple(parse_json_field(item.get('referencedFiles') or '')),
+            whitelisted=is_author_in_whitelist(author),
+        )
 
-                    # 智能调频：检测到白名单作者推文时触发高频模式
-                    if is_author_in_whitelist(author):
-                        trigger_token_boost(author)
-        time.sleep(1)
+    @property
+    def item_id(self):
+        """与去重索引一致的推文 ID"""
+        event_time = '' if self.event_time is None else self.event_time
+        return f"{event_time}_{self.author}_{self.event_type}"
+
+    def to_event(self):
+        """推送给下游的标准事件"""
+        return {
+            'id': self.event_time,
+            'type': self.event_type,
+            'time': '' if self.event_time is None else self.event_time,
+            'author': self.author,
+            'authorName': self.author_name,
+            'avatar': self.avatar,
+            'content': self.content,
+            'images': list(self.images),
+            'videos': list(self.videos),
+            'refAuthor': self.ref_author,
+            'refAuthorName': self.ref_author_name,
+            'refAvatar': self.ref_avatar,
+            'refContent': self.ref_content,
+            'refImages': list(self.ref_images),
+            'whitelisted': self.whitelisted,
+        }
+
+    def recent_json(self):
+        """/recent 使用的 JSON（id 为去重 ID）"""
+        if self._recent_json is None:
+            item = self.to_event()
+            item['id'] = self.item_id
+            item['time'] = self.event_time or 0
+            self._recent_json = json.dumps(item, ensure_ascii=False)
+        return self._recent_json
+
+
+def publish_news(record):
+    """推文写入持久化日志和内存日志（推送给订阅者）"""
+    try:
+        news_archive.append(record.to_event())
+    except Exception as e:
+        log_error(f"持久化: {e}")
+    news_log.append(record)
+    stats['total_news'] += 1
+
+
+def ingest_news(new_items):
+    """将新推文（已去重、按时间排序）写入推文日志"""
+    with ingest_lock:
+        for item in new_items:
+            user = item.get('user', {})
+            author = user.get('handle', 'Unknown')
+
+            # 白名单过滤
+            if not is_author_allowed(author):
+                stats['filtered_by_whitelist'] += 1
+                continue
+
+            publish_news(NewsRecord.from_api(item))
+            print(f"[推文] @{author} - {item.get('eventType', '')}", flush=True)
+
+            # 智能调频：检测到白名单作者推文时触发高频模式，所有分组加速轮询
+            if is_author_in_whitelist(author):
+                request_token_boost(author)
+                for scheduler in group_schedulers.values():
+                    scheduler.mark_hot()
+
+
+def news_fetcher(group_id):
+    """单个分组的轮询线程"""
+    scheduler = group_schedulers[group_id]
+    print(f"开始获取推文 (分组 {group_id})...", flush=True)
+    # 首次成功轮询拿到的是接口回看范围内的积压推文（可能是几分钟到几小时前），不计入发现延迟
+    warmed_up = False
+    while stats['running']:
+        start = time.time()
+        data = fetch_news(group_id, scheduler)
+        stats['last_fetch'] = group_stats[group_id]['last_fetch'] = time.time()
+        scheduler.record_request(stats['last_fetch'] - start)
+        new_items = get_new_items(data, record_latency=warmed_up)
+        if data and 'data' in data:
+            warmed_up = True
+        if new_items:
+            group_stats[group_id]['new_items'] += len(new_items)
+            ingest_news(new_items)
+        time.sleep(scheduler.next_delay(time.time() - start))
 
 
 @app.route('/stream')
 def stream():
+    # 断线重连时从客户端上次收到的序号续传
+    start_cursor = parse_last_event_id(request.headers.get('Last-Event-ID'), news_log.last_seq)
+
     def generate():
-        last_idx = 0
-        heartbeat_count = 0
+        cursor = start_cursor
         while True:
-            with news_lock:
-                if len(news_list) > last_idx:
-                    for item in news_list[last_idx:]:
-                        user = item.get('user') or {}
-                        ref_user = item.get('referenceUser') or {}
-                        event_type = item.get('eventType', '')
-
-                        # 解析图片和视频
-                        images = parse_json_field(item.get('fileUrls') or '')
-                        videos = parse_json_field(item.get('videoUrls') or '')
-                        ref_images = parse_json_field(item.get('referencedFiles') or '')
-
-                        # 原推内容
-                        ref_content = ''
-                        if event_type in ('reply', 'retweet', 'quote'):
-                            ref_content = item.get('contentOld') or ''
-
-                        event_data = {
-                            'id': item.get('eventTime'),
-                            'type': event_type,
-                            'time': item.get('eventTime', ''),
-                            'author': user.get('handle', 'Unknown'),
-                            'authorName': user.get('username', ''),
-                            'avatar': user.get('profilePic', ''),
-                            'content': item.get('contentNew') or '',
-                            'images': images,
-                            'videos': videos,
-                            'refAuthor': ref_user.get('handle', ''),
-                            'refAuthorName': ref_user.get('username', ''),
-                            'refAvatar': ref_user.get('profilePic', ''),
-                            'refContent': ref_content,
-                            'refImages': ref_images,
-                        }
-                        yield f"data: {json.dumps(event_data, ensure_ascii=False)}\n\n"
-                    last_idx = len(news_list)
-                    heartbeat_count = 0
-            # 每30次循环(约15秒)发送心跳
-            heartbeat_count += 1
-            if heartbeat_count >= 30:
-                yield ": heartbeat\n\n"
-                heartbeat_count = 0
-            time.sleep(0.5)
+            # 阻塞等待新推文，超时则发送心跳
+            events = news_log.read_since(cursor, timeout=HEARTBEAT_INTERVAL)
+            if not events:
+                yield b": heartbeat\n\n"
+                continue
+            for seq, record in events:
+                yield format_event_id(seq) + record.sse
+                cursor = seq
+    return Response(generate(), mimetype='text/event-stream')
+
+
+@app.route('/replay')
+def replay():
+    """
+    回放持久化日志中的历史推文（SSE，格式同 /stream）
+    - from / to: 入库时间范围（Unix 秒），to 默认为当前时间
+    - speed: 回放倍速，1 为原速，0 为不等待全速回放
+    """
+    try:
+        start = float(request.args.get('from', 0))
+        end = float(request.args.get('to') or time.time())
+        speed = float(request.args.get('speed', 1))
+    except ValueError:
+        return jsonify({'error': 'from/to/speed 必须是数字'}), 400
+    if speed < 0:
+        return jsonify({'error': 'speed 不能为负数'}), 400
+
+    def generate():
+        count = 0
+        prev_ts = None
+        for ts, event in news_archive.read(start, end):
+            # 按原始时间间隔（除以倍速）推送
+            if speed > 0 and prev_ts is not None and ts > prev_ts:
+                # 长间隔分段等待并发送心跳（同 /stream），避免客户端读超时断开
+                remaining = (ts - prev_ts) / speed
+                while remaining > HEARTBEAT_INTERVAL:
+                    time.sleep(HEARTBEAT_INTERVAL)
+                    remaining -= HEARTBEAT_INTERVAL
+                    yield ": heartbeat\n\n"
+                time.sleep(remaining)
+            prev_ts = ts
+            count += 1
+            yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+        yield f"event: end\ndata: {json.dumps({'count': count})}\n\n"
     return Response(generate(), mimetype='text/event-stream')
 
 
@@ -246,12 +571,24 @@ def status():
         'port': config.NEWS_PORT,
         'running': stats['running'],
         'total_news': stats['total_news'],
+        'news_buffered': len(news_log),
+        'last_seq': news_log.last_seq,
         'last_fetch': stats['last_fetch'],
         'last_success': stats['last_success'],
         'errors': stats['errors'],
         'enable_whitelist': enable_whitelist,
         'whitelist_count': whitelist_count,
-        'filtered_by_whitelist': stats['filtered_by_whitelist']
+        'filtered_by_whitelist': stats['filtered_by_whitelist'],
+        'dedup': seen_ids.get_stats(),
+        'boost_requested': stats['boost_requested'],
+        'boost_sent': stats['boost_sent'],
+        'groups': {
+            gid: dict(group_stats[gid], poll=scheduler.get_stats())
+            for gid, scheduler in group_schedulers.items()
+        },
+        'detect_latency': detect_latency.get_stats(),
+        'http_pool': http_pool.get_pool_stats(),
+        'archive': news_archive.get_stats(),
     })
 
 
@@ -270,45 +607,14 @@ def parse_json_field(field):
 @app.route('/recent')
 def recent():
     """返回最近的推文和错误"""
-    with news_lock:
-        recent_items = news_list[-10:][::-1]
+    recent_records = [record for _, record in news_log.latest(10)][::-1]
     with error_lock:
         recent_errors = list(error_log)[::-1]
 
-    items = []
-    for item in recent_items:
-        user = item.get('user') or {}
-        ref_user = item.get('referenceUser') or {}
-        event_type = item.get('eventType', '')
-        content = item.get('contentNew') or ''
-
-        # 解析图片和视频
-        images = parse_json_field(item.get('fileUrls') or '')
-        videos = parse_json_field(item.get('videoUrls') or '')
-        ref_images = parse_json_field(item.get('referencedFiles') or '')
-
-        # 原推内容（reply/retweet/quote时）
-        ref_content = ''
-        if event_type in ('reply', 'retweet', 'quote'):
-            ref_content = item.get('contentOld') or ''
-
-        items.append({
-            'id': f"{item.get('eventTime', '')}_{user.get('handle', '')}_{event_type}",
-            'author': user.get('handle', 'Unknown'),
-            'authorName': user.get('username', ''),
-            'avatar': user.get('profilePic', ''),
-            'content': content,
-            'type': event_type,
-            'time': item.get('eventTime', 0),
-            'images': images,
-            'videos': videos,
-            'refAuthor': ref_user.get('handle', ''),
-            'refAuthorName': ref_user.get('username', ''),
-            'refAvatar': ref_user.get('profilePic', ''),
-            'refContent': ref_content,
-            'refImages': ref_images
-        })
-    return jsonify({'items': items, 'errors': recent_errors})
+    # 直接拼接入库时预编码的 JSON，不再逐条重新序列化
+    items_json = ','.join(record.recent_json() for record in recent_records)
+    body = f'{{"items": [{items_json}], "errors": {json.dumps(recent_errors, ensure_ascii=False)}}}'
+    return Response(body, mimetype='application/json')
 
 
 @app.route('/inject', methods=['POST'])
@@ -367,9 +673,7 @@ def inject():
         'referencedFiles': '[]'
     }
 
-    with news_lock:
-        news_list.append(item)
-        stats['total_news'] += 1
+    publish_news(NewsRecord.from_api(item))
 
     print(f"[注入] @{author} - {content[:50]}..." + (f" (含{len(file_urls)}张图)" if file_urls else ""), flush=True)
     return jsonify({'success': True, 'time': item['eventTime'], 'images': len(file_urls)})
@@ -472,7 +776,8 @@ if __name__ == "__main__":
     port = config.get_port('news')
     print(f"推文发现服务启动: http://127.0.0.1:{port}", flush=True)
 
-    fetcher_thread = threading.Thread(target=news_fetcher, daemon=True)
-    fetcher_thread.start()
+    for group in NEWS_GROUPS:
+        threading.Thread(target=news_fetcher, args=(group['groupId'],), daemon=True).start()
+    threading.Thread(target=boost_dispatcher, daemon=True).start()
 
     app.run(host='0.0.0.0', port=port, debug=False, threaded=True)
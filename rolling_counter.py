@@ -0,0 +1,68 @@
+"""
+滚动窗口计数器
+- 每秒一个桶的固定数组，记录和读取都是常数时间，内存与窗口长度成正比
+- 用于 /status 中"最近 60 秒调用次数"一类的频率统计，替代时间戳列表
+- KeyedRollingCounter 按 key 分别计数，窗口内无记录的 key 自动淘汰
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class RollingCounter:
+    """最近 window 秒内的事件计数"""
+
+    def __init__(self, window=60):
+        self.window = window
+        self._counts = [0] * window
+        self._seconds = [-1] * window  # 每个桶对应的整秒，用于识别已过期的桶
+        self._lock = threading.Lock()
+
+    def add(self, n=1, now=None):
+        second = int(now if now is not None else time.time())
+        i = second % self.window
+        with self._lock:
+            if self._seconds[i] != second:
+                self._seconds[i] = second
+                self._counts[i] = 0
+            self._counts[i] += n
+
+    def total(self, now=None):
+        """最近 window 秒内的计数和"""
+        oldest = int(now if now is not None else time.time()) - self.window
+        with self._lock:
+            return sum(c for c, s in zip(self._counts, self._seconds) if s > oldest)
+
+    def rate(self, now=None):
+        """每秒平均次数"""
+        return self.total(now) / self.window
+
+
+class KeyedRollingCounter:
+    """按 key 分别计数的滚动窗口计数器"""
+
+    def __init__(self, window=60):
+        self.window = window
+        self._counters = OrderedDict()  # key -> (RollingCounter, 最后记录时间)，最久未记录的在前
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._counters)
+
+    def add(self, key, n=1, now=None):
+        now = now if now is not None else time.time()
+        with self._lock:
+            entry = self._counters.pop(key, None)
+            counter = entry[0] if entry else RollingCounter(self.window)
+            self._counters[key] = (counter, now)
+            # 淘汰整个窗口内都没有记录的 key
+            while self._counters:
+                _, last = next(iter(self._counters.values()))
+                if now - last < self.window:
+                    break
+                self._counters.popitem(last=False)
+        counter.add(n, now)
+
+    def total(self, key, now=None):
+        entry = self._counters.get(key)
+        return entry[0].total(now) if entry else 0
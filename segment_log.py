@@ -0,0 +1,96 @@
+"""
+分段追加日志
+- 按时间切分为多个 JSONL 段文件（默认每小时一段），只追加不修改
+- 每行 {"ts": 写入时间, "data": 记录}，写入即 flush，进程崩溃最多丢失一行
+- 支持按时间范围顺序读取，超过保留期的段自动删除
+"""
+import os
+import json
+import time
+import threading
+
+
+class SegmentLog:
+    """按时间分段的追加日志"""
+
+    def __init__(self, directory, prefix, segment_seconds=3600, retention_seconds=7 * 86400):
+        self.directory = directory
+        self.prefix = prefix
+        self.segment_seconds = segment_seconds
+        self.retention_seconds = retention_seconds
+        self._file = None
+        self._segment_id = None
+        self._lock = threading.Lock()
+        self.written = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _segment_path(self, segment_id):
+        return os.path.join(self.directory, f"{self.prefix}-{segment_id}.jsonl")
+
+    def _list_segments(self):
+        """返回 [(segment_id, path)]，按时间升序"""
+        segments = []
+        head = f"{self.prefix}-"
+        for name in os.listdir(self.directory):
+            if name.startswith(head) and name.endswith('.jsonl'):
+                try:
+                    segment_id = int(name[len(head):-len('.jsonl')])
+                except ValueError:
+                    continue
+                segments.append((segment_id, os.path.join(self.directory, name)))
+        segments.sort()
+        return segments
+
+    def _rotate(self, segment_id):
+        """切换到新段并清理过期段（调用方持有锁）"""
+        if self._file:
+            self._file.close()
+        self._file = open(self._segment_path(segment_id), 'a', encoding='utf-8')
+        self._segment_id = segment_id
+        oldest_kept = segment_id - int(self.retention_seconds // self.segment_seconds)
+        for old_id, path in self._list_segments():
+            if old_id < oldest_kept:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def append(self, record, ts=None):
+        """追加一条记录（未指定 ts 时在锁内取时间，多线程写入时文件内 ts 保持有序）"""
+        with self._lock:
+            ts = ts if ts is not None else time.time()
+            line = json.dumps({'ts': ts, 'data': record}, ensure_ascii=False)
+            segment_id = int(ts // self.segment_seconds)
+            if segment_id != self._segment_id:
+                self._rotate(segment_id)
+            self._file.write(line + '\n')
+            self._file.flush()
+            self.written += 1
+
+    def read(self, start=0, end=None):
+        """按时间顺序读取 [start, end] 范围内的记录，生成 (ts, record)"""
+        end = end if end is not None else time.time()
+        first_id = int(start // self.segment_seconds)
+        last_id = int(end // self.segment_seconds)
+        for segment_id, path in self._list_segments():
+            if segment_id < first_id or segment_id > last_id:
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # 崩溃时写了一半的行
+                    ts = entry.get('ts', 0)
+                    # 调用方自带 ts 时行序不保证与 ts 一致，逐行过滤而不提前结束
+                    if ts < start or ts > end:
+                        continue
+                    yield ts, entry.get('data')
+
+    def get_stats(self):
+        segments = self._list_segments()
+        return {
+            'segments': len(segments),
+            'bytes': sum(os.path.getsize(path) for _, path in segments),
+            'written': self.written,
+        }
@@ -6,10 +6,28 @@ echo "正在停止 Meme Tracker 服务..."
 # 通过进程名停止
 services=("trade_service.py" "alpha_call_service.py" "news_service.py" "token_service.py" "tracker_service.py" "match_service.py" "dashboard.py")
 
+# 先发送 SIGTERM，让服务正常退出（token_service 退出时写入代币快照）
 for service in "${services[@]}"; do
     pid=$(pgrep -f "$service" 2>/dev/null)
     if [ -n "$pid" ]; then
         echo "  停止 $service (PID: $pid)"
+        pkill -TERM -f "$service" 2>/dev/null
+    fi
+done
+
+# 最多等待 5 秒，仍未退出的强制结束
+for i in 1 2 3 4 5; do
+    running=0
+    for service in "${services[@]}"; do
+        pgrep -f "$service" >/dev/null 2>&1 && running=1
+    done
+    [ "$running" -eq 0 ] && break
+    sleep 1
+done
+
+for service in "${services[@]}"; do
+    if pgrep -f "$service" >/dev/null 2>&1; then
+        echo "  强制停止 $service"
         pkill -9 -f "$service" 2>/dev/null
     fi
 done
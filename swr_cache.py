@@ -0,0 +1,126 @@
+"""
+过期后台刷新缓存 (stale-while-revalidate)
+- TTL 内直接返回缓存；过期但仍在 stale_ttl 内时立即返回旧值，并在后台刷新一次
+- 无可用值（或旧值过老）时同步加载，并发请求合并为一次上游调用
+- 每个版本预编码 JSON 并计算 ETag，内容变化时通知订阅者
+"""
+import hashlib
+import json
+import threading
+import time
+
+
+class CacheEntry:
+    """一个缓存版本"""
+    __slots__ = ('value', 'body', 'etag', 'version', 'fetched_at')
+
+    def __init__(self, value, version, fetched_at):
+        self.value = value
+        self.body = json.dumps(value, ensure_ascii=False).encode('utf-8')
+        self.etag = hashlib.sha1(self.body).hexdigest()[:16]
+        self.version = version
+        self.fetched_at = fetched_at
+
+
+class SWRCache:
+    """单个数据源的 stale-while-revalidate 缓存"""
+
+    def __init__(self, name, loader, ttl, stale_ttl):
+        self.name = name
+        self.loader = loader        # 无参函数，返回可 JSON 序列化的值，失败时抛异常
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl  # 超过该时间的旧值先同步加载，失败时才返回旧值
+        self._entry = None
+        self._lock = threading.Lock()          # 保护 _entry / _refreshing
+        self._load_lock = threading.Lock()     # 同一时间只有一个上游请求
+        self._refreshing = False
+        self._listeners = []
+        self.loads = 0
+        self.load_errors = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.last_error = None
+
+    def on_change(self, callback):
+        """注册内容变化回调 callback(name, entry)"""
+        self._listeners.append(callback)
+
+    def _load(self):
+        """调用上游并更新缓存，返回最新版本（调用方持有 _load_lock）"""
+        self.loads += 1
+        try:
+            value = self.loader()
+        except Exception as e:
+            self.load_errors += 1
+            self.last_error = str(e)
+            raise
+        self.last_error = None
+        now = time.time()
+        with self._lock:
+            old = self._entry
+            entry = CacheEntry(value, (old.version + 1) if old else 1, now)
+            if old and old.etag == entry.etag:
+                old.fetched_at = now  # 内容未变，只续期
+                return old
+            self._entry = entry
+        for callback in self._listeners:
+            try:
+                callback(self.name, entry)
+            except Exception as e:
+                print(f"[{self.name}] 变化通知失败: {e}", flush=True)
+        return entry
+
+    def _refresh_in_background(self):
+        def run():
+            try:
+                with self._load_lock:
+                    self._load()
+            except Exception:
+                pass  # 保留旧值，错误已记录在 last_error
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def get(self):
+        """返回当前 CacheEntry；无可用值且加载失败时抛出异常"""
+        now = time.time()
+        with self._lock:
+            entry = self._entry
+            age = now - entry.fetched_at if entry else None
+            if entry and age < self.ttl:
+                self.hits += 1
+                return entry
+            if entry and age < self.stale_ttl:
+                self.stale_hits += 1
+                if not self._refreshing:
+                    self._refreshing = True
+                    self._refresh_in_background()
+                return entry
+        with self._load_lock:
+            # 等锁期间其他请求可能已完成加载
+            entry = self._entry
+            if entry and time.time() - entry.fetched_at < self.ttl:
+                self.hits += 1
+                return entry
+            try:
+                return self._load()
+            except Exception:
+                if entry:
+                    return entry
+                raise
+
+    def get_stats(self):
+        entry = self._entry
+        return {
+            'version': entry.version if entry else 0,
+            'etag': entry.etag if entry else None,
+            'age': round(time.time() - entry.fetched_at, 1) if entry else None,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'loads': self.loads,
+            'load_errors': self.load_errors,
+            'last_error': self.last_error,
+        }
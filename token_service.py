@@ -3,13 +3,25 @@
 - 监听 Binance 新币
 - 提供 SSE 流
 """
-import requests
+import os
 import time
+import atexit
 import json
+import signal
+import sys
+import random
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from flask import Flask, Response, jsonify
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from flask import Flask, Response, jsonify, request
 import config
+import http_pool
+from event_log import EventLog, format_event_id, parse_last_event_id
+from rolling_counter import RollingCounter, KeyedRollingCounter
+from segment_log import SegmentLog
+from swr_cache import SWRCache
+from token_store import TokenRecord, TokenStore
 
 app = Flask(__name__)
 
@@ -20,28 +32,219 @@ stats = {
     'last_fetch': None,
     'last_success': None,
     'errors': 0,
-    'fetch_times': [],  # 最近60秒的调用时间戳
+    'update_events': 0,  # 已推送的行情更新事件数
+    'snapshot_restored': 0,  # 启动时从快照恢复的代币数
+    'snapshot_saved': None,
+    'snapshot_tokens': 0,
+    'snapshot_ms': 0,
 }
+fetch_counter = RollingCounter(60)  # 最近60秒的调用次数（所有链）
 
 # ==================== 智能调频配置 ====================
-# 普通模式：每 5 秒请求一次
-# 高频模式：每 1 秒请求一次（白名单作者发推文时触发）
-NORMAL_INTERVAL = 5  # 普通模式间隔（秒）
-BOOST_INTERVAL = 1   # 高频模式间隔（秒）
+# 多档位自适应调频：每轮根据新币到达率、上游错误/限流、撮合服务待匹配的白名单会话、
+# 白名单推文触发的高频模式和上游请求预算选择档位
+RATE_LEVELS = [
+    ('idle', 10),    # 长时间无新币
+    ('normal', 5),   # 普通模式
+    ('active', 2),   # 新币密集 / 有待匹配的白名单推文
+    ('boost', 1),    # 白名单作者发推文
+    ('burst', 0.5),  # 高频模式且新币密集
+]
+LEVEL_INDEX = {name: i for i, (name, _) in enumerate(RATE_LEVELS)}
+NORMAL_INTERVAL = RATE_LEVELS[LEVEL_INDEX['normal']][1]
+BOOST_INTERVAL = RATE_LEVELS[LEVEL_INDEX['boost']][1]
 BOOST_DURATION = 60  # 高频模式持续时间（秒）
 
+ACTIVE_ARRIVALS = 10   # 最近 60 秒新币数达到该值进入 active 档
+IDLE_AFTER = 300       # 超过该时间（秒）无新币且无其他信号时降为 idle 档
+ERROR_RATE_LIMIT = 0.5  # 最近 60 秒失败率超过该值降一档
+
+# 每个上游每分钟的请求预算（本进程内所有经该上游 Session 的请求合计）
+UPSTREAM_BUDGETS = {
+    'binance': 120,
+    'dexscreener': 60,
+}
+
+# 每条链独立抓取：所用上游、最高档位、是否参与高频模式
+CHAIN_CONFIGS = {
+    'BSC': {'upstream': 'binance', 'max_level': 'burst', 'boost': True},
+    'SOL': {'upstream': 'dexscreener', 'max_level': 'active', 'boost': False},
+}
+MAX_BACKOFF = 30  # 连续失败时的最大退避间隔（秒）
+
+# 撮合服务中待匹配的白名单推文会话数（窗口内仍在等待新币），后台定期拉取
+# 只统计白名单作者，普通推文会话几乎一直存在，不作为加速依据
+MATCH_STATUS_INTERVAL = 5
+match_signals = {'whitelisted_sessions': 0, 'updated': None}
+
 # 调频状态
 boost_state = {
     'active': False,           # 是否处于高频模式
     'expire_time': 0,          # 高频模式过期时间
     'trigger_author': None,    # 触发高频的作者
     'trigger_time': None,      # 触发时间
+    'chains': set(),           # 参与本次高频的链
 }
 boost_lock = threading.Lock()
 
-# 代币字典 (key: tokenAddress, value: token data)
-token_dict = {}
+# 代币存储 (key: chain:address, value: TokenRecord)
+# 按最后出现时间淘汰：超过容量或 TOKEN_MAX_AGE 内未再被接口返回的代币移出内存
+TOKEN_STORE_MAX = 20000
+TOKEN_MAX_AGE = 6 * 3600
+# 被淘汰的代币写入磁盘分段日志（设为 False 则直接丢弃）
+TOKEN_SPILL_ENABLED = True
+TOKEN_SPILL_DIR = os.path.join(os.path.dirname(__file__), 'token_archive')
+TOKEN_SPILL_RETENTION = 3 * 86400
+token_store = TokenStore(
+    TOKEN_STORE_MAX, TOKEN_MAX_AGE,
+    spill=SegmentLog(TOKEN_SPILL_DIR, 'evicted', retention_seconds=TOKEN_SPILL_RETENTION) if TOKEN_SPILL_ENABLED else None,
+)
 token_lock = threading.Lock()
+# 代币存储快照：定期写入，启动时恢复，重启后已见代币不会再被当作新币推送
+TOKEN_SNAPSHOT_FILE = os.path.join(os.path.dirname(__file__), 'token_snapshot.json')
+TOKEN_SNAPSHOT_INTERVAL = 30  # 秒
+TOKEN_SNAPSHOT_VERSION = 1
+# 新代币事件日志（有界环形缓冲，序号即 SSE id），订阅者按游标读取，不再扫描代币存储
+TOKEN_LOG_CAPACITY = 5000
+token_log = EventLog(TOKEN_LOG_CAPACITY)
+HEARTBEAT_INTERVAL = 15  # SSE 心跳间隔（秒）
+# 行情更新事件：已知代币的价格/市值/持有人相对上次推送变化超过阈值时写入，由 /updates 推送
+UPDATE_LOG_CAPACITY = 5000
+update_log = EventLog(UPDATE_LOG_CAPACITY)
+UPDATE_THRESHOLDS = {'price': 0.05, 'marketCap': 0.05, 'holders': 0.05}  # 相对变化阈值
+UPDATE_MIN_INTERVAL = 2  # 同一代币两次更新事件的最短间隔（秒）
+# /recent 分页（看板每秒轮询，只取最新一页）
+RECENT_DEFAULT_LIMIT = 200
+RECENT_MAX_LIMIT = 1000
+
+
+def build_token_event(record):
+    """构建推送给下游的代币事件，预编码为 SSE data 帧"""
+    return f"data: {json.dumps(record.to_stream(), ensure_ascii=False)}\n\n".encode('utf-8')
+
+
+def add_token(unique_id, record):
+    """新代币入库并追加到事件日志（调用方持有 token_lock）"""
+    token_store.add(unique_id, record)
+    record.mark_published()
+    token_log.append(build_token_event(record))
+
+
+def to_float(value):
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def relative_change(old, new):
+    """相对变化比例（旧值为 0 时只要新值非 0 即视为 100%）"""
+    old, new = to_float(old), to_float(new)
+    if old == new:
+        return 0.0
+    if not old:
+        return 1.0
+    return abs(new - old) / abs(old)
+
+
+def publish_update(record, now=None):
+    """行情变化超过阈值且距上次推送足够久时写入更新事件（调用方持有 token_lock）"""
+    now = now if now is not None else time.time()
+    published_at, price, market_cap, holders = record.published or (0, '', '', '')
+    if now - published_at < UPDATE_MIN_INTERVAL:
+        return False
+    changes = {}
+    for key, old, new in (('price', price, record.price),
+                          ('marketCap', market_cap, record.market_cap),
+                          ('holders', holders, record.holders)):
+        change = relative_change(old, new)
+        if change >= UPDATE_THRESHOLDS[key]:
+            changes[key] = round(change, 4)
+    if not changes:
+        return False
+    event = {
+        'tokenAddress': record.address,
+        'tokenSymbol': record.symbol,
+        'chain': record.chain,
+        'price': record.price,
+        'marketCap': record.market_cap,
+        'holders': record.holders,
+        'liquidity': record.liquidity,
+        'changes': changes,
+        'time': int(now * 1000),
+    }
+    frame = f"data: {json.dumps(event, ensure_ascii=False)}\n\n".encode('utf-8')
+    update_log.append((record.address.lower(), frame))
+    record.mark_published(now)
+    stats['update_events'] += 1
+    return True
+
+
+def upsert_token(unique_id, item, chain):
+    """已有代币刷新行情（变化明显时推送更新事件），新代币入库，返回是否为新代币（调用方持有 token_lock）"""
+    if unique_id in token_store:
+        publish_update(token_store.touch(unique_id, item))
+        return False
+    add_token(unique_id, TokenRecord.from_raw(item, chain))
+    return True
+
+def save_token_snapshot():
+    """写入代币存储快照（先写临时文件再替换，崩溃时不会留下半个快照）"""
+    start = time.time()
+    with token_lock:
+        rows = token_store.dump_rows()
+    snapshot = {
+        'version': TOKEN_SNAPSHOT_VERSION,
+        'saved_at': start,
+        'fields': ['id'] + list(TokenRecord.SNAPSHOT_FIELDS),
+        'tokens': rows,
+    }
+    tmp_path = TOKEN_SNAPSHOT_FILE + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, TOKEN_SNAPSHOT_FILE)
+    stats['snapshot_saved'] = time.time()
+    stats['snapshot_tokens'] = len(rows)
+    stats['snapshot_ms'] = round((time.time() - start) * 1000, 1)
+
+
+def load_token_snapshot():
+    """启动时恢复代币存储：恢复的代币视为已见，不写入事件日志、不推送给下游"""
+    if not os.path.exists(TOKEN_SNAPSHOT_FILE):
+        return 0
+    start = time.time()
+    try:
+        with open(TOKEN_SNAPSHOT_FILE, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+        if snapshot.get('version') != TOKEN_SNAPSHOT_VERSION:
+            print(f"[快照] 版本不匹配，忽略: {snapshot.get('version')}", flush=True)
+            return 0
+        with token_lock:
+            restored = token_store.load_rows(snapshot.get('tokens', []))
+            for record in restored:
+                record.mark_published()
+    except Exception as e:
+        log_error(f"快照加载失败: {e}")
+        return 0
+    stats['snapshot_restored'] = len(restored)
+    print(f"[快照] 恢复 {len(restored)} 个代币，耗时 {(time.time() - start) * 1000:.0f}ms", flush=True)
+    return len(restored)
+
+
+def token_snapshotter():
+    """后台线程：定期写入代币存储快照"""
+    while stats['running']:
+        time.sleep(TOKEN_SNAPSHOT_INTERVAL)
+        try:
+            save_token_snapshot()
+        except Exception as e:
+            log_error(f"快照写入失败: {e}")
+
+
+def handle_sigterm(sig, frame):
+    """收到 SIGTERM（stop.sh / start.py 停止服务）时正常退出，由 atexit 写入最后一次快照"""
+    sys.exit(0)
+
 
 # 错误日志
 error_log = []
@@ -58,32 +261,132 @@ def log_error(msg):
     stats['errors'] += 1
 
 
-def get_current_interval():
-    """获取当前的请求间隔（基于是否处于高频模式）"""
+def check_boost(chain):
+    """指定链是否处于高频模式（过期时自动恢复并打印）"""
     with boost_lock:
-        if boost_state['active']:
-            current_time = time.time()
-            if current_time < boost_state['expire_time']:
-                return BOOST_INTERVAL
-            else:
-                # 高频模式过期，自动恢复普通模式
-                boost_state['active'] = False
-                boost_state['expire_time'] = 0
-                author = boost_state['trigger_author'] or 'unknown'
-                print(f"[智能调频] 高频模式结束，恢复普通模式 (触发者: @{author})", flush=True)
-        return NORMAL_INTERVAL
-
-
-def activate_boost_mode(author=None):
-    """激活高频模式"""
+        if not boost_state['active']:
+            return False
+        if time.time() < boost_state['expire_time']:
+            return chain in boost_state['chains']
+        # 高频模式过期，自动恢复普通模式
+        boost_state['active'] = False
+        boost_state['expire_time'] = 0
+        author = boost_state['trigger_author'] or 'unknown'
+        print(f"[智能调频] 高频模式结束，恢复自适应调频 (触发者: @{author})", flush=True)
+        return False
+
+
+class UpstreamMonitor:
+    """按上游统计最近 60 秒的请求数（取自连接池计数）和 429 次数"""
+
+    def __init__(self):
+        self.samples = {}   # upstream -> deque[(time, 累计请求数)]
+        self.limited = KeyedRollingCounter(60)  # upstream -> 429 次数
+        self.lock = threading.Lock()
+
+    def note_rate_limited(self, upstream):
+        self.limited.add(upstream)
+
+    def usage(self, upstream, now=None):
+        """返回 (最近 60 秒请求数, 最近 60 秒 429 次数)"""
+        now = now if now is not None else time.time()
+        total = http_pool.get_pool_stats().get(upstream, {}).get('requests', 0)
+        with self.lock:
+            samples = self.samples.setdefault(upstream, deque())
+            samples.append((now, total))
+            while len(samples) > 1 and now - samples[1][0] >= 60:
+                samples.popleft()
+            return total - samples[0][1], self.limited.total(upstream, now)
+
+
+upstream_monitor = UpstreamMonitor()
+
+
+def choose_rate(fetcher, now=None):
+    """
+    为一条链选择调频档位，返回 (档位名, 间隔秒, 原因列表)
+    - 新币到达率高、撮合服务有待匹配的白名单推文 → active
+    - 白名单作者触发高频 → boost，同时新币密集 → burst
+    - 长时间无新币且无其他信号 → idle
+    - 最近出现 429 降两档，失败率高降一档，上游请求预算用尽降一档
+    - 不超过该链的最高档位，间隔不低于预算允许的下限
+    """
+    now = now if now is not None else time.time()
+    cfg = CHAIN_CONFIGS[fetcher.chain]
+    level = LEVEL_INDEX['normal']
+    reasons = []
+
+    arrivals = fetcher.arrivals_60s(now)
+    sessions = match_signals['whitelisted_sessions']
+    boosted = cfg['boost'] and check_boost(fetcher.chain)
+    if arrivals >= ACTIVE_ARRIVALS:
+        level = LEVEL_INDEX['active']
+        reasons.append(f"新币 {arrivals}/分钟")
+    if sessions:
+        level = max(level, LEVEL_INDEX['active'])
+        reasons.append(f"待匹配白名单推文 {sessions} 条")
+    if boosted:
+        busy = arrivals >= ACTIVE_ARRIVALS or sessions
+        level = max(level, LEVEL_INDEX['burst' if busy else 'boost'])
+        reasons.append(f"高频模式 (@{boost_state['trigger_author'] or 'unknown'})")
+    if level == LEVEL_INDEX['normal'] and fetcher.last_arrival and now - fetcher.last_arrival > IDLE_AFTER:
+        level = LEVEL_INDEX['idle']
+        reasons.append(f"{int(now - fetcher.last_arrival)} 秒无新币")
+
+    used, limited = upstream_monitor.usage(cfg['upstream'], now)
+    budget = UPSTREAM_BUDGETS.get(cfg['upstream'])
+    if limited:
+        level -= 2
+        reasons.append(f"{cfg['upstream']} 限流 {limited} 次")
+    error_rate = fetcher.error_rate_60s(now)
+    if error_rate > ERROR_RATE_LIMIT:
+        level -= 1
+        reasons.append(f"失败率 {error_rate:.0%}")
+    if budget and used >= budget:
+        level -= 1
+        reasons.append(f"{cfg['upstream']} 预算用尽 {used}/{budget}")
+
+    max_level = LEVEL_INDEX[cfg['max_level']]
+    if level > max_level:
+        level = max_level
+        reasons.append(f"上限 {cfg['max_level']}")
+    level = max(0, level)
+    name, interval = RATE_LEVELS[level]
+    if budget and interval < 60.0 / budget:
+        interval = 60.0 / budget
+        reasons.append(f"预算下限 {interval:.2f}秒")
+    return name, interval, reasons or ['默认']
+
+
+def match_status_poller():
+    """后台线程：定期拉取撮合服务中待匹配的白名单推文会话数"""
+    while stats['running']:
+        try:
+            resp = requests.get(f"{config.get_service_url('match')}/status", timeout=2,
+                                proxies={'http': None, 'https': None})
+            if resp.status_code == 200:
+                match_signals['whitelisted_sessions'] = resp.json().get('whitelisted_sessions', 0)
+                match_signals['updated'] = time.time()
+        except Exception:
+            match_signals['whitelisted_sessions'] = 0  # 撮合服务不可用时不作为加速依据
+        time.sleep(MATCH_STATUS_INTERVAL)
+
+
+def activate_boost_mode(author=None, chains=None):
+    """激活高频模式（chains 为空时作用于所有参与高频的链）"""
+    boostable = [c for c, cfg in CHAIN_CONFIGS.items() if cfg['boost']]
+    chains = [c for c in (chains or boostable) if c in boostable]
     with boost_lock:
         current_time = time.time()
         was_active = boost_state['active'] and current_time < boost_state['expire_time']
 
+        boost_state['chains'] = (boost_state['chains'] | set(chains)) if was_active else set(chains)
         boost_state['active'] = True
         boost_state['expire_time'] = current_time + BOOST_DURATION
         boost_state['trigger_author'] = author
         boost_state['trigger_time'] = current_time
+        for chain in chains:
+            chain_fetchers[chain].wake.set()
 
         if was_active:
             print(f"[智能调频] 高频模式延长至 {BOOST_DURATION} 秒 (触发者: @{author or 'unknown'})", flush=True)
@@ -96,7 +399,8 @@ def activate_boost_mode(author=None):
             'interval': BOOST_INTERVAL,
             'duration': BOOST_DURATION,
             'expire_time': boost_state['expire_time'],
-            'trigger_author': author
+            'trigger_author': author,
+            'chains': sorted(boost_state['chains']),
         }
 
 # BSC 链配置 (Binance API)
@@ -107,61 +411,100 @@ DEXSCREENER_LATEST_URL = "https://api.dexscreener.com/token-profiles/latest/v1"
 DEXSCREENER_TOKEN_URL = "https://api.dexscreener.com/latest/dex/tokens"
 
 
+DEXSCREENER_BATCH_SIZE = 30   # DexScreener 单次最多查询的地址数（逗号分隔）
+DEXSCREENER_DETAIL_WORKERS = 3  # 详情请求并发上限
+SOL_DETAIL_LIMIT = 60         # 每轮最多补全的新代币数
+dexscreener_executor = ThreadPoolExecutor(max_workers=DEXSCREENER_DETAIL_WORKERS)
+
+
+def fetch_dexscreener_pairs(addresses):
+    """批量查询 DexScreener 代币详情，返回 {address: 首个交易对}"""
+    try:
+        resp = http_pool.get_session('dexscreener').get(
+            f"{DEXSCREENER_TOKEN_URL}/{','.join(addresses)}",
+            headers={'accept': 'application/json', 'User-Agent': 'Mozilla/5.0'},
+            proxies=config.PROXIES,
+            timeout=5
+        )
+        if resp.status_code != 200:
+            if resp.status_code == 429:
+                upstream_monitor.note_rate_limited('dexscreener')
+            log_error(f"DexScreener 详情 HTTP {resp.status_code}")
+            return {}
+        wanted = set(addresses)
+        result = {}
+        for pair in resp.json().get('pairs') or []:
+            address = (pair.get('baseToken') or {}).get('address')
+            if address in wanted and address not in result:
+                result[address] = pair
+        return result
+    except Exception as e:
+        log_error(f"DexScreener 详情: {e}")
+        return {}
+
+
 def fetch_solana_tokens():
-    """从 DexScreener 获取 Solana 新代币"""
+    """从 DexScreener 获取 Solana 新代币（请求失败返回 None）"""
     try:
-        response = requests.get(
+        response = http_pool.get_session('dexscreener').get(
             DEXSCREENER_LATEST_URL,
             headers={'accept': 'application/json', 'User-Agent': 'Mozilla/5.0'},
             proxies=config.PROXIES,
             timeout=10
         )
         if response.status_code != 200:
+            if response.status_code == 429:
+                upstream_monitor.note_rate_limited('dexscreener')
             log_error(f"DexScreener HTTP {response.status_code}")
-            return []
+            return None
 
         all_tokens = response.json()
-        solana_tokens = [t for t in all_tokens if t.get('chainId') == 'solana']
+        addresses = [t.get('tokenAddress') for t in all_tokens
+                     if t.get('chainId') == 'solana' and t.get('tokenAddress')]
+
+        # 只补全尚未入库的代币，按批合并请求；已入库的只刷新最后出现时间，避免仍在列表中的代币被当作过期淘汰
+        with token_lock:
+            new_addresses = []
+            known_ids = []
+            for a in dict.fromkeys(addresses):
+                unique_id = f"SOL:{a}"
+                if unique_id in token_store:
+                    known_ids.append(unique_id)
+                else:
+                    new_addresses.append(a)
+            token_store.touch_seen(known_ids)
+        new_addresses = new_addresses[:SOL_DETAIL_LIMIT]
+        if not new_addresses:
+            return []
+        batches = [new_addresses[i:i + DEXSCREENER_BATCH_SIZE]
+                   for i in range(0, len(new_addresses), DEXSCREENER_BATCH_SIZE)]
+        pairs = {}
+        for result in dexscreener_executor.map(fetch_dexscreener_pairs, batches):
+            pairs.update(result)
 
-        # 获取每个代币的详细信息
         detailed_tokens = []
-        for token in solana_tokens[:20]:  # 限制数量避免请求过多
-            token_address = token.get('tokenAddress')
-            if not token_address:
+        for token_address in new_addresses:
+            pair = pairs.get(token_address)
+            if not pair:
                 continue
-
-            try:
-                detail_resp = requests.get(
-                    f"{DEXSCREENER_TOKEN_URL}/{token_address}",
-                    headers={'accept': 'application/json', 'User-Agent': 'Mozilla/5.0'},
-                    proxies=config.PROXIES,
-                    timeout=5
-                )
-                if detail_resp.status_code == 200:
-                    detail_data = detail_resp.json()
-                    pairs = detail_data.get('pairs', [])
-                    if pairs:
-                        pair = pairs[0]
-                        detailed_tokens.append({
-                            'contractAddress': token_address,
-                            'symbol': pair.get('baseToken', {}).get('symbol', ''),
-                            'name': pair.get('baseToken', {}).get('name', ''),
-                            'chain': 'SOL',
-                            'price': pair.get('priceUsd', ''),
-                            'marketCap': pair.get('marketCap', 0),
-                            'liquidity': pair.get('liquidity', {}).get('usd', 0),
-                            'volume': pair.get('volume', {}).get('h24', 0),
-                            'createTime': pair.get('pairCreatedAt', 0),
-                            'holders': 0,  # DexScreener 不提供 holders
-                        })
-            except Exception as e:
-                pass  # 单个代币获取失败不影响整体
+            detailed_tokens.append({
+                'contractAddress': token_address,
+                'symbol': pair.get('baseToken', {}).get('symbol', ''),
+                'name': pair.get('baseToken', {}).get('name', ''),
+                'chain': 'SOL',
+                'price': pair.get('priceUsd', ''),
+                'marketCap': pair.get('marketCap', 0),
+                'liquidity': (pair.get('liquidity') or {}).get('usd', 0),
+                'volume': (pair.get('volume') or {}).get('h24', 0),
+                'createTime': pair.get('pairCreatedAt', 0),
+                'holders': 0,  # DexScreener 不提供 holders
+            })
 
         return detailed_tokens
     except Exception as e:
         log_error(f"DexScreener 请求: {e}")
         print(f"DexScreener 请求异常: {e}", flush=True)
-        return []
+        return None
 
 
 def fetch_tokens_for_chain(chain):
@@ -173,7 +516,7 @@ def fetch_tokens_for_chain(chain):
         "holdersMin": 1
     }
     try:
-        response = requests.post(
+        response = http_pool.get_session('binance').post(
             config.BINANCE_TOKEN_URL,
             headers=config.HEADERS,
             cookies=config.COOKIES,
@@ -194,6 +537,8 @@ def fetch_tokens_for_chain(chain):
                 item['chain'] = chain['name']
             return data
         else:
+            if response.status_code == 429:
+                upstream_monitor.note_rate_limited('binance')
             log_error(f"HTTP [{chain['name']}] {response.status_code}")
     except Exception as e:
         log_error(f"请求 [{chain['name']}]: {e}")
@@ -201,65 +546,114 @@ def fetch_tokens_for_chain(chain):
     return None
 
 
-def is_boost_active():
-    """检查是否处于高频模式"""
+def is_boost_active(chain=None):
+    """检查是否处于高频模式（指定链时检查该链是否参与）"""
     with boost_lock:
-        return boost_state['active'] and time.time() < boost_state['expire_time']
-
-
-def fetch_tokens():
-    """获取所有链的代币（并行请求，高频模式只请求BSC）"""
-    all_success = True
-    results = {}
-    boost_mode = is_boost_active()
-
-    def fetch_bsc():
-        """获取 BSC 代币"""
-        return ('BSC', fetch_tokens_for_chain(BSC_CHAIN))
-
-    def fetch_sol():
-        """获取 Solana 代币"""
-        return ('SOL', fetch_solana_tokens())
-
-    # 高频模式只请求 BSC，普通模式并行请求所有链
-    with ThreadPoolExecutor(max_workers=2) as executor:
-        futures = [executor.submit(fetch_bsc)]
-        if not boost_mode:
-            futures.append(executor.submit(fetch_sol))
-
-        for future in as_completed(futures):
-            try:
-                chain, data = future.result()
-                results[chain] = data
-            except Exception as e:
-                print(f"[Token] 并行获取异常: {e}", flush=True)
-
-    # 处理 BSC 结果
-    bsc_data = results.get('BSC')
-    if bsc_data:
-        new_items, _ = process_tokens(bsc_data, 'BSC')
+        active = boost_state['active'] and time.time() < boost_state['expire_time']
+        return active and (chain is None or chain in boost_state['chains'])
+
+
+class ChainFetcher:
+    """单链抓取循环：独立的调频档位、错误退避和统计，慢链不拖累其他链"""
+
+    def __init__(self, chain, fetch_fn, process_fn):
+        self.chain = chain
+        self.fetch_fn = fetch_fn
+        self.process_fn = process_fn
+        self.consecutive_errors = 0
+        self.fetches = RollingCounter(60)   # 最近60秒的调用次数
+        self.failures = RollingCounter(60)  # 最近60秒的失败次数
+        self.arrivals = RollingCounter(60)  # 最近60秒的新币数
+        self.last_arrival = None
+        self.level = 'normal'
+        self.interval = NORMAL_INTERVAL
+        self.reasons = []
+        self.wake = threading.Event()  # 高频模式激活时提前结束本轮等待
+        self.last_fetch = None
+        self.last_success = None
+        self.last_duration = 0
+        self.total_fetches = 0
+        self.total_errors = 0
+        self.new_tokens = 0
+
+    def arrivals_60s(self, now):
+        return self.arrivals.total(now)
+
+    def error_rate_60s(self, now):
+        fetches = self.fetches.total(now)
+        return self.failures.total(now) / fetches if fetches else 0.0
+
+    def next_interval(self):
+        """下一轮间隔：连续失败时指数退避（带抖动），否则按自适应档位"""
+        self.level, self.interval, self.reasons = choose_rate(self)
+        interval = self.interval
+        if self.consecutive_errors:
+            backoff = min(MAX_BACKOFF, interval * (2 ** self.consecutive_errors))
+            return backoff * random.uniform(0.5, 1.0)
+        return interval
+
+    def run_once(self):
+        """执行一轮抓取和入库"""
+        start = time.time()
+        try:
+            data = self.fetch_fn()
+        except Exception as e:
+            log_error(f"[{self.chain}] 抓取异常: {e}")
+            data = None
+        now = time.time()
+        self.last_duration = now - start
+        self.last_fetch = stats['last_fetch'] = now
+        self.total_fetches += 1
+        self.fetches.add(now=now)
+        fetch_counter.add(now=now)
+
+        if data is None:
+            self.failures.add(now=now)
+            self.consecutive_errors += 1
+            self.total_errors += 1
+            return
+        self.consecutive_errors = 0
+        self.last_success = stats['last_success'] = now
+
+        new_items, _ = self.process_fn(data)
+        if self.last_arrival is None:
+            self.last_arrival = now  # 首轮成功作为空闲计时起点
         if new_items:
+            self.arrivals.add(len(new_items), now)
+            self.last_arrival = now
+            self.new_tokens += len(new_items)
             stats['total_tokens'] += len(new_items)
             for item in new_items:
                 symbol = item.get('symbol', '') or item.get('tokenSymbol', 'Unknown')
-                print(f"[新币] [BSC] {symbol}", flush=True)
-    else:
-        all_success = False
-
-    # 处理 Solana 结果（仅普通模式）
-    if not boost_mode:
-        sol_tokens = results.get('SOL')
-        if sol_tokens:
-            new_items, _ = process_solana_tokens(sol_tokens)
-            if new_items:
-                stats['total_tokens'] += len(new_items)
-                for item in new_items:
-                    symbol = item.get('symbol', 'Unknown')
-                    print(f"[新币] [SOL] {symbol}", flush=True)
-
-    if all_success:
-        stats['last_success'] = time.time()
-    return all_success
+                print(f"[新币] [{self.chain}] {symbol}", flush=True)
+
+    def run(self):
+        cfg = CHAIN_CONFIGS[self.chain]
+        boost_str = "参与" if cfg['boost'] else "不参与"
+        print(f"[{self.chain}] 开始获取新币: 自适应调频 (最高 {cfg['max_level']} 档), 高频模式 {boost_str}", flush=True)
+        while stats['running']:
+            start = time.time()
+            self.run_once()
+            # 扣除本轮耗时，保持稳定的请求节奏
+            self.wake.wait(max(0, self.next_interval() - (time.time() - start)))
+            self.wake.clear()
+
+    def get_stats(self):
+        fetch_count_60s = self.fetches.total()
+        return {
+            'interval': self.interval,
+            'level': self.level,
+            'reasons': self.reasons,
+            'boost_active': is_boost_active(self.chain),
+            'consecutive_errors': self.consecutive_errors,
+            'total_fetches': self.total_fetches,
+            'total_errors': self.total_errors,
+            'new_tokens': self.new_tokens,
+            'last_fetch': self.last_fetch,
+            'last_success': self.last_success,
+            'last_duration': round(self.last_duration, 3),
+            'fetch_count_60s': fetch_count_60s,
+        }
 
 
 def process_solana_tokens(tokens):
@@ -273,14 +667,11 @@ def process_solana_tokens(tokens):
             if not token_id:
                 continue
 
-            unique_id = f"SOL:{token_id}"
-
-            if unique_id in token_dict:
-                token_dict[unique_id].update(item)
-                updated_count += 1
-            else:
-                token_dict[unique_id] = item
+            if upsert_token(f"SOL:{token_id}", item, 'SOL'):
                 new_items.append(item)
+            else:
+                updated_count += 1
+        token_store.evict_expired()
 
     return new_items, updated_count
 
@@ -305,64 +696,71 @@ def process_tokens(data, chain_name='BSC'):
 
             # 用 chain:address 作为唯一标识
             unique_id = f"{chain_name}:{token_id}"
-            item['chain'] = chain_name
 
-            if unique_id in token_dict:
-                # 更新已有代币数据
-                token_dict[unique_id].update(item)
-                updated_count += 1
-            else:
-                # 新代币
-                token_dict[unique_id] = item
+            if upsert_token(unique_id, item, chain_name):
                 new_items.append(item)
+            else:
+                updated_count += 1
+        token_store.evict_expired()
 
     return new_items, updated_count
 
 
+chain_fetchers = {
+    'BSC': ChainFetcher('BSC', lambda: fetch_tokens_for_chain(BSC_CHAIN), lambda data: process_tokens(data, 'BSC')),
+    'SOL': ChainFetcher('SOL', fetch_solana_tokens, process_solana_tokens),
+}
+
+
 def token_fetcher():
+    """为每条链启动独立的抓取线程"""
     print("开始获取新币...", flush=True)
-    print(f"[智能调频] 普通模式: {NORMAL_INTERVAL}秒/次, 高频模式: {BOOST_INTERVAL}秒/次", flush=True)
-    while stats['running']:
-        fetch_tokens()
-        now = time.time()
-        stats['last_fetch'] = now
-        # 记录调用时间，用于计算实际频率
-        stats['fetch_times'].append(now)
-        # 只保留最近60秒的记录
-        stats['fetch_times'] = [t for t in stats['fetch_times'] if now - t < 60]
-        interval = get_current_interval()
-        time.sleep(interval)
+    threading.Thread(target=match_status_poller, daemon=True).start()
+    for fetcher in chain_fetchers.values():
+        threading.Thread(target=fetcher.run, daemon=True).start()
 
 
 @app.route('/stream')
 def stream():
+    # 断线重连时从客户端上次收到的序号续传
+    start_cursor = parse_last_event_id(request.headers.get('Last-Event-ID'), token_log.last_seq)
+
+    def generate():
+        cursor = start_cursor
+        while True:
+            # 阻塞等待新代币，超时则发送心跳
+            events = token_log.read_since(cursor, timeout=HEARTBEAT_INTERVAL)
+            if not events:
+                yield b": heartbeat\n\n"
+                continue
+            for seq, frame in events:
+                yield format_event_id(seq) + frame
+                cursor = seq
+    return Response(generate(), mimetype='text/event-stream')
+
+
+@app.route('/updates')
+def updates():
+    """
+    已知代币的行情更新事件（SSE）
+    - 只推送价格/市值/持有人变化超过 UPDATE_THRESHOLDS 的代币，同一代币至多每 UPDATE_MIN_INTERVAL 秒一次
+    - ?addresses=a,b 只订阅指定地址；支持 Last-Event-ID 续传
+    """
+    addresses = {a.strip().lower() for a in request.args.get('addresses', '').split(',') if a.strip()}
+    start_cursor = parse_last_event_id(request.headers.get('Last-Event-ID'), update_log.last_seq)
+
     def generate():
-        sent_ids = set()
-        heartbeat_count = 0
+        cursor = start_cursor
         while True:
-            with token_lock:
-                for token_id, item in token_dict.items():
-                    if token_id not in sent_ids:
-                        sent_ids.add(token_id)
-                        token_data = {
-                            'tokenAddress': item.get('contractAddress', '') or item.get('tokenAddress', ''),
-                            'tokenSymbol': item.get('symbol', '') or item.get('tokenSymbol', ''),
-                            'tokenName': item.get('name', '') or item.get('tokenName', ''),
-                            'chain': item.get('chain', 'BSC'),
-                            'price': item.get('price', ''),
-                            'marketCap': item.get('marketCap', ''),
-                            'holders': item.get('holders', ''),
-                            'liquidity': item.get('liquidity', ''),
-                            'createTime': item.get('createTime', ''),
-                        }
-                        yield f"data: {json.dumps(token_data, ensure_ascii=False)}\n\n"
-                        heartbeat_count = 0
-            # 每30次循环(约15秒)发送心跳
-            heartbeat_count += 1
-            if heartbeat_count >= 30:
-                yield ": heartbeat\n\n"
-                heartbeat_count = 0
-            time.sleep(0.5)
+            events = update_log.read_since(cursor, timeout=HEARTBEAT_INTERVAL)
+            if not events:
+                yield b": heartbeat\n\n"
+                continue
+            for seq, (address, frame) in events:
+                cursor = seq
+                if addresses and address not in addresses:
+                    continue
+                yield format_event_id(seq) + frame
     return Response(generate(), mimetype='text/event-stream')
 
 
@@ -376,15 +774,16 @@ def status():
             'boost_expire_time': boost_state['expire_time'] if is_active else None,
             'boost_remaining': max(0, boost_state['expire_time'] - current_time) if is_active else 0,
             'boost_trigger_author': boost_state['trigger_author'] if is_active else None,
-            'current_interval': BOOST_INTERVAL if is_active else NORMAL_INTERVAL,
+            'boost_chains': sorted(boost_state['chains']) if is_active else [],
+            'current_interval': chain_fetchers['BSC'].interval,
+            'rate_level': chain_fetchers['BSC'].level,
             'normal_interval': NORMAL_INTERVAL,
             'boost_interval': BOOST_INTERVAL,
         }
     # 计算实际频率：最近60秒内的调用次数
-    recent_fetches = [t for t in stats['fetch_times'] if current_time - t < 60]
-    fetch_count_60s = len(recent_fetches)
+    fetch_count_60s = fetch_counter.total(current_time)
     # 计算每秒频率
-    fetch_per_second = fetch_count_60s / 60.0 if fetch_count_60s > 0 else 0
+    fetch_per_second = fetch_count_60s / 60.0
     return jsonify({
         'service': 'token_service',
         'port': config.TOKEN_PORT,
@@ -395,6 +794,18 @@ def status():
         'errors': stats['errors'],
         'fetch_count_60s': fetch_count_60s,
         'fetch_per_second': round(fetch_per_second, 2),
+        'http_pool': http_pool.get_pool_stats(),
+        'token_store': token_store.get_stats(),
+        'update_events': stats['update_events'],
+        'snapshot': {
+            'restored': stats['snapshot_restored'],
+            'saved_at': stats['snapshot_saved'],
+            'tokens': stats['snapshot_tokens'],
+            'write_ms': stats['snapshot_ms'],
+        },
+        'updates_buffered': len(update_log),
+        'list_caches': {name: cache.get_stats() for name, cache in list_caches.items()},
+        'chains': {chain: fetcher.get_stats() for chain, fetcher in chain_fetchers.items()},
         **boost_info
     })
 
@@ -405,48 +816,78 @@ def boost():
     from flask import request
     data = request.json or {}
     author = data.get('author', '')
-    result = activate_boost_mode(author)
+    result = activate_boost_mode(author, data.get('chains'))
     return jsonify(result)
 
 
 @app.route('/boost/status', methods=['GET'])
 def boost_status():
-    """获取高频模式状态"""
+    """获取高频模式状态和各链当前调频档位及原因"""
+    rates = {
+        chain: {'level': fetcher.level, 'interval': fetcher.interval, 'reasons': fetcher.reasons}
+        for chain, fetcher in chain_fetchers.items()
+    }
+    budgets = {}
+    for upstream, budget in UPSTREAM_BUDGETS.items():
+        used, limited = upstream_monitor.usage(upstream)
+        budgets[upstream] = {'budget_per_min': budget, 'used_60s': used, 'rate_limited_60s': limited}
     with boost_lock:
         current_time = time.time()
         is_active = boost_state['active'] and current_time < boost_state['expire_time']
         return jsonify({
             'active': is_active,
-            'current_interval': BOOST_INTERVAL if is_active else NORMAL_INTERVAL,
+            'current_interval': rates['BSC']['interval'],
             'expire_time': boost_state['expire_time'] if is_active else None,
             'remaining_seconds': max(0, boost_state['expire_time'] - current_time) if is_active else 0,
             'trigger_author': boost_state['trigger_author'] if is_active else None,
             'trigger_time': boost_state['trigger_time'] if is_active else None,
+            'chains': sorted(boost_state['chains']) if is_active else [],
+            'rates': rates,
+            'levels': dict(RATE_LEVELS),
+            'match_whitelisted_sessions': match_signals['whitelisted_sessions'],
+            'upstreams': budgets,
         })
 
 
+def encode_cursor(key):
+    create_time, unique_id = key
+    return f"{create_time}:{unique_id}"
+
+
+def decode_cursor(value):
+    create_time, unique_id = value.split(':', 1)
+    return int(create_time), unique_id
+
+
 @app.route('/recent')
 def recent():
-    """返回最近的代币和错误"""
+    """
+    返回最近的代币和错误（按创建时间倒序分页）
+    - limit: 每页数量，默认 RECENT_DEFAULT_LIMIT
+    - since: 只返回 createTime（毫秒）大于该值的代币，用于增量轮询
+    - cursor: 上一页返回的 next_cursor，继续向更早的代币翻页
+    - chain: 只返回指定链的代币
+    """
+    try:
+        limit = min(max(1, int(request.args.get('limit', RECENT_DEFAULT_LIMIT))), RECENT_MAX_LIMIT)
+        since = int(request.args['since']) if request.args.get('since') else None
+        cursor = decode_cursor(request.args['cursor']) if request.args.get('cursor') else None
+    except ValueError:
+        return jsonify({'error': 'limit/since/cursor 格式错误'}), 400
+    chain = request.args.get('chain') or None
+
     with token_lock:
-        # 按创建时间排序，显示全部
-        sorted_tokens = sorted(token_dict.values(), key=lambda x: x.get('createTime', 0), reverse=True)
-        recent_items = sorted_tokens
+        records, next_cursor = token_store.newest(limit, since=since, cursor=cursor, chain=chain)
+        items = [record.to_recent() for record in records]
+        total = len(token_store)
     with error_lock:
         recent_errors = list(error_log)[::-1]
-
-    items = []
-    for item in recent_items:
-        items.append({
-            'address': item.get('contractAddress') or item.get('tokenAddress', ''),
-            'symbol': item.get('symbol') or item.get('tokenSymbol', 'Unknown'),
-            'name': item.get('name') or item.get('tokenName', ''),
-            'chain': item.get('chain', 'BSC'),
-            'marketCap': item.get('marketCap', 0),
-            'holders': item.get('holders', 0),
-            'time': item.get('createTime', 0)
-        })
-    return jsonify({'items': items, 'errors': recent_errors})
+    return jsonify({
+        'items': items,
+        'errors': recent_errors,
+        'total': total,
+        'next_cursor': encode_cursor(next_cursor) if next_cursor else None,
+    })
 
 
 @app.route('/inject', methods=['POST'])
@@ -474,7 +915,7 @@ def inject():
     }
 
     with token_lock:
-        token_dict[address] = token
+        add_token(address, TokenRecord.from_raw(token))
         stats['total_tokens'] += 1
 
     print(f"[注入] 代币: {symbol} ({name or symbol}), CA: {address}", flush=True)
@@ -486,104 +927,152 @@ def health():
     return jsonify({'status': 'ok'})
 
 
-@app.route('/exclusive')
-def exclusive():
-    """获取 Binance 优质代币列表"""
+# ==================== 优质 / Alpha 代币列表 ====================
+# 共享 stale-while-revalidate 缓存：看板、撮合服务、交易服务都从这里取，
+# 无论多少请求方，Binance 每个刷新周期只收到一次请求
+BINANCE_LIST_HEADERS = {
+    'accept': '*/*',
+    'content-type': 'application/json',
+    'clienttype': 'web',
+    'lang': 'en',
+    'user-agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+}
+EXCLUSIVE_URL = 'https://web3.binance.com/bapi/defi/v1/public/wallet-direct/buw/wallet/market/token/pulse/exclusive/rank/list?chainId=56'
+ALPHA_URL = 'https://web3.binance.com/bapi/defi/v1/public/wallet-direct/buw/wallet/market/token/pulse/exclusive/in/alpha/token/list'
+LIST_CACHE_TTL = 60          # 缓存有效期（秒）
+LIST_CACHE_STALE_TTL = 600   # 过期后仍可先返回旧值的时间（秒）
+LIST_EVENT_CAPACITY = 100
+list_events = EventLog(LIST_EVENT_CAPACITY)
+
+
+def list_item(t, **extra):
+    """Binance 列表接口的代币转为统一格式"""
+    meta = t.get('metaInfo', {}) or {}
+    return {
+        'address': t.get('contractAddress', ''),
+        'symbol': t.get('symbol', ''),
+        'name': meta.get('name', '') or t.get('symbol', ''),
+        'chain': 'BSC',
+        'marketCap': t.get('marketCap', 0),
+        'holders': t.get('holders', 0),
+        'liquidity': t.get('liquidity', 0),
+        'price': t.get('price', 0),
+        'time': t.get('createTime', 0),
+        'priceChange24h': float(t.get('percentChange', 0) or 0) / 100,  # 转为小数
+        'volume24h': t.get('volume', 0),
+        **extra
+    }
+
+
+def fetch_binance_list(url, label):
+    """请求 Binance 列表接口，返回 data 字段（失败抛异常，由缓存保留旧值）"""
     try:
-        headers = {
-            'accept': '*/*',
-            'content-type': 'application/json',
-            'clienttype': 'web',
-            'lang': 'en',
-            'user-agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        }
-        resp = requests.get(
-            'https://web3.binance.com/bapi/defi/v1/public/wallet-direct/buw/wallet/market/token/pulse/exclusive/rank/list?chainId=56',
-            headers=headers,
+        resp = http_pool.get_session('binance').get(
+            url,
+            headers=BINANCE_LIST_HEADERS,
             proxies=config.PROXIES,
             timeout=10
         )
-        if resp.status_code == 200:
-            data = resp.json()
-            tokens = data.get('data', {}).get('tokens', []) or []
-            items = []
-            for t in tokens:
-                meta = t.get('metaInfo', {}) or {}
-                items.append({
-                    'address': t.get('contractAddress', ''),
-                    'symbol': t.get('symbol', ''),
-                    'name': meta.get('name', '') or t.get('symbol', ''),
-                    'chain': 'BSC',
-                    'marketCap': t.get('marketCap', 0),
-                    'holders': t.get('holders', 0),
-                    'time': t.get('createTime', 0),
-                    'priceChange24h': float(t.get('percentChange', 0) or 0) / 100,  # 转为小数
-                    'volume24h': t.get('volume', 0)
-                })
-            return jsonify({'items': items})
-        else:
-            log_error(f"Binance exclusive API HTTP {resp.status_code}")
-            return jsonify({'items': [], 'error': f'HTTP {resp.status_code}'}), 400
     except Exception as e:
-        log_error(f"Binance exclusive API: {e}")
-        return jsonify({'items': [], 'error': str(e)}), 500
+        log_error(f"Binance {label} API: {e}")
+        raise
+    if resp.status_code != 200:
+        if resp.status_code == 429:
+            upstream_monitor.note_rate_limited('binance')
+        log_error(f"Binance {label} API HTTP {resp.status_code}")
+        raise RuntimeError(f'HTTP {resp.status_code}')
+    return resp.json().get('data')
 
 
-@app.route('/alpha')
-def alpha():
+def load_exclusive_tokens():
+    """获取 Binance 优质代币列表"""
+    data = fetch_binance_list(EXCLUSIVE_URL, 'exclusive') or {}
+    return [list_item(t) for t in data.get('tokens', []) or []]
+
+
+def load_alpha_tokens():
     """获取 Binance Alpha 代币列表"""
+    # API 返回格式: data 可能是列表或字典
+    raw_data = fetch_binance_list(ALPHA_URL, 'alpha')
+    if isinstance(raw_data, list):
+        tokens = raw_data
+    elif isinstance(raw_data, dict):
+        tokens = raw_data.get('tokens', []) or []
+    else:
+        tokens = []
+    return [list_item(t, isAlpha=True) for t in tokens]
+
+
+def notify_list_change(name, entry):
+    """列表内容变化时写入 /lists/events"""
+    event = {'list': name, 'etag': entry.etag, 'version': entry.version, 'count': len(entry.value)}
+    list_events.append(f"data: {json.dumps(event)}\n\n".encode('utf-8'))
+    print(f"[{name}] 列表更新: {len(entry.value)} 个代币 (版本 {entry.version})", flush=True)
+
+
+list_caches = {
+    'exclusive': SWRCache('exclusive', load_exclusive_tokens, LIST_CACHE_TTL, LIST_CACHE_STALE_TTL),
+    'alpha': SWRCache('alpha', load_alpha_tokens, LIST_CACHE_TTL, LIST_CACHE_STALE_TTL),
+}
+for _cache in list_caches.values():
+    _cache.on_change(notify_list_change)
+
+
+def list_response(name):
+    """从缓存返回列表，支持 If-None-Match 条件请求"""
     try:
-        headers = {
-            'accept': '*/*',
-            'content-type': 'application/json',
-            'clienttype': 'web',
-            'lang': 'en',
-            'user-agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        }
-        resp = requests.get(
-            'https://web3.binance.com/bapi/defi/v1/public/wallet-direct/buw/wallet/market/token/pulse/exclusive/in/alpha/token/list',
-            headers=headers,
-            proxies=config.PROXIES,
-            timeout=10
-        )
-        if resp.status_code == 200:
-            data = resp.json()
-            # API 返回格式: data 可能是列表或字典
-            raw_data = data.get('data', [])
-            if isinstance(raw_data, list):
-                tokens = raw_data
-            elif isinstance(raw_data, dict):
-                tokens = raw_data.get('tokens', []) or []
-            else:
-                tokens = []
-            items = []
-            for t in tokens:
-                meta = t.get('metaInfo', {}) or {}
-                items.append({
-                    'address': t.get('contractAddress', ''),
-                    'symbol': t.get('symbol', ''),
-                    'name': meta.get('name', '') or t.get('symbol', ''),
-                    'chain': 'BSC',
-                    'marketCap': t.get('marketCap', 0),
-                    'holders': t.get('holders', 0),
-                    'time': t.get('createTime', 0),
-                    'priceChange24h': float(t.get('percentChange', 0) or 0) / 100,
-                    'volume24h': t.get('volume', 0),
-                    'isAlpha': True
-                })
-            return jsonify({'items': items})
-        else:
-            log_error(f"Binance alpha API HTTP {resp.status_code}")
-            return jsonify({'items': [], 'error': f'HTTP {resp.status_code}'}), 400
+        entry = list_caches[name].get()
     except Exception as e:
-        log_error(f"Binance alpha API: {e}")
         return jsonify({'items': [], 'error': str(e)}), 500
+    if entry.etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        response = Response(b'{"items": ' + entry.body + b'}', mimetype='application/json')
+    response.set_etag(entry.etag)
+    response.headers['X-Cache-Age'] = str(int(time.time() - entry.fetched_at))
+    return response
+
+
+@app.route('/exclusive')
+def exclusive():
+    """获取 Binance 优质代币列表"""
+    return list_response('exclusive')
+
+
+@app.route('/alpha')
+def alpha():
+    """获取 Binance Alpha 代币列表"""
+    return list_response('alpha')
+
+
+@app.route('/lists/events')
+def list_events_stream():
+    """优质 / Alpha 列表变化通知（SSE），支持 Last-Event-ID 续传"""
+    start_cursor = parse_last_event_id(request.headers.get('Last-Event-ID'), list_events.last_seq)
+
+    def generate():
+        cursor = start_cursor
+        while True:
+            events = list_events.read_since(cursor, timeout=HEARTBEAT_INTERVAL)
+            if not events:
+                yield b": heartbeat\n\n"
+                continue
+            for seq, frame in events:
+                yield format_event_id(seq) + frame
+                cursor = seq
+    return Response(generate(), mimetype='text/event-stream')
 
 
 if __name__ == "__main__":
     port = config.get_port('token')
     print(f"代币发现服务启动: http://127.0.0.1:{port}", flush=True)
 
+    # 先恢复快照，避免首轮抓取把已见代币当作新币推送
+    load_token_snapshot()
+    atexit.register(save_token_snapshot)
+    signal.signal(signal.SIGTERM, handle_sigterm)
+    threading.Thread(target=token_snapshotter, daemon=True).start()
+
     # 先启动后台获取线程，不阻塞服务启动
     fetcher_thread = threading.Thread(target=token_fetcher, daemon=True)
     fetcher_thread.start()
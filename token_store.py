@@ -0,0 +1,259 @@
+"""
+代币存储
+- TokenRecord: 入库时标准化的精简代币记录（__slots__），不再持有接口原始 dict
+- TokenStore: 按 chain:address O(1) 查找，按最后出现时间 LRU 排序
+  超过容量或长时间未再出现的代币被淘汰，可选写入磁盘分段日志
+- 按 createTime 维护有序索引（bisect 插入），最近代币分页查询 O(log n + k)
+- 支持导出/导入紧凑快照（按字段顺序的行），重启时恢复已见代币
+- 非线程安全，调用方负责加锁
+"""
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+
+
+def _to_int(value):
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+class TokenRecord:
+    """标准化代币记录"""
+    __slots__ = (
+        'address', 'symbol', 'name', 'chain', 'price', 'market_cap',
+        'holders', 'liquidity', 'volume', 'create_time', 'last_seen', 'published',
+    )
+
+    # 每次抓取都会变化的行情字段: (属性名, 接口字段名)
+    MARKET_FIELDS = (
+        ('price', 'price'),
+        ('market_cap', 'marketCap'),
+        ('holders', 'holders'),
+        ('liquidity', 'liquidity'),
+        ('volume', 'volume'),
+    )
+
+    def __init__(self, address, symbol, name, chain, price='', market_cap='', holders='',
+                 liquidity='', volume='', create_time=0, last_seen=None):
+        self.address = address
+        self.symbol = symbol
+        self.name = name
+        self.chain = chain
+        self.price = price
+        self.market_cap = market_cap
+        self.holders = holders
+        self.liquidity = liquidity
+        self.volume = volume
+        self.create_time = create_time
+        self.last_seen = last_seen if last_seen is not None else time.time()
+        # 最近一次推送时的 (时间, 价格, 市值, 持有人)，作为更新事件的比较基准
+        self.published = None
+
+    @classmethod
+    def from_raw(cls, item, chain=None):
+        """从 Binance / DexScreener 接口数据构建"""
+        return cls(
+            address=item.get('contractAddress', '') or item.get('tokenAddress', ''),
+            symbol=item.get('symbol', '') or item.get('tokenSymbol', ''),
+            name=item.get('name', '') or item.get('tokenName', ''),
+            chain=chain or item.get('chain', 'BSC'),
+            price=item.get('price', ''),
+            market_cap=item.get('marketCap', ''),
+            holders=item.get('holders', ''),
+            liquidity=item.get('liquidity', ''),
+            volume=item.get('volume', ''),
+            create_time=_to_int(item.get('createTime')),
+        )
+
+    def update(self, item):
+        """用最新一次抓取的数据刷新行情字段"""
+        for attr, key in self.MARKET_FIELDS:
+            if key in item:
+                setattr(self, attr, item[key])
+        self.last_seen = time.time()
+
+    def to_stream(self):
+        """推送给 match_service 的格式"""
+        return {
+            'tokenAddress': self.address,
+            'tokenSymbol': self.symbol,
+            'tokenName': self.name,
+            'chain': self.chain,
+            'price': self.price,
+            'marketCap': self.market_cap,
+            'holders': self.holders,
+            'liquidity': self.liquidity,
+            'createTime': self.create_time,
+        }
+
+    def to_recent(self):
+        """/recent 的展示格式"""
+        return {
+            'address': self.address,
+            'symbol': self.symbol or 'Unknown',
+            'name': self.name,
+            'chain': self.chain,
+            'marketCap': self.market_cap or 0,
+            'holders': self.holders or 0,
+            'time': self.create_time,
+        }
+
+    def mark_published(self, now=None):
+        self.published = (now if now is not None else time.time(), self.price, self.market_cap, self.holders)
+
+    # 快照中每行的字段顺序（不含推送基准 published）
+    SNAPSHOT_FIELDS = (
+        'address', 'symbol', 'name', 'chain', 'price', 'market_cap',
+        'holders', 'liquidity', 'volume', 'create_time', 'last_seen',
+    )
+
+    def to_row(self):
+        return [getattr(self, attr) for attr in self.SNAPSHOT_FIELDS]
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(*row)
+
+    def to_dict(self):
+        """完整字段（用于落盘）"""
+        return {attr: getattr(self, attr) for attr in self.__slots__ if attr != 'published'}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{attr: data[attr] for attr in cls.__slots__ if attr in data and attr != 'published'})
+
+
+class TokenStore:
+    """有界代币存储（LRU + 最大存活时间）"""
+
+    def __init__(self, max_size, max_age, spill=None):
+        self.max_size = max_size
+        self.max_age = max_age
+        self.spill = spill  # 可选 SegmentLog，淘汰的代币写入磁盘
+        self._records = OrderedDict()  # unique_id -> TokenRecord，最久未出现的在前
+        self._by_time = []  # [(create_time, unique_id)]，按创建时间升序
+        self.evicted = 0
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, unique_id):
+        return unique_id in self._records
+
+    def get(self, unique_id):
+        return self._records.get(unique_id)
+
+    def values(self):
+        return self._records.values()
+
+    def items(self):
+        return self._records.items()
+
+    def add(self, unique_id, record):
+        """新增代币，超出容量时淘汰最久未出现的代币"""
+        old = self._records.get(unique_id)
+        if old is not None:
+            self._unindex(unique_id, old)
+        self._records[unique_id] = record
+        insort(self._by_time, (record.create_time, unique_id))
+        self._records.move_to_end(unique_id)
+        while len(self._records) > self.max_size:
+            self._evict_oldest()
+
+    def touch(self, unique_id, item):
+        """已有代币再次出现：刷新行情并移到队尾，返回记录"""
+        record = self._records[unique_id]
+        record.update(item)
+        self._records.move_to_end(unique_id)
+        return record
+
+    def touch_seen(self, unique_ids, now=None):
+        """已有代币再次出现但没有新行情（如只拿到地址列表）：只刷新最后出现时间并移到队尾，返回刷新数"""
+        now = now if now is not None else time.time()
+        count = 0
+        for unique_id in unique_ids:
+            record = self._records.get(unique_id)
+            if record is not None:
+                record.last_seen = now
+                self._records.move_to_end(unique_id)
+                count += 1
+        return count
+
+    def evict_expired(self, now=None):
+        """淘汰超过 max_age 未再出现的代币，返回淘汰数量"""
+        cutoff = (now if now is not None else time.time()) - self.max_age
+        count = 0
+        while self._records:
+            record = next(iter(self._records.values()))
+            if record.last_seen >= cutoff:
+                break
+            self._evict_oldest()
+            count += 1
+        return count
+
+    def _evict_oldest(self):
+        unique_id, record = self._records.popitem(last=False)
+        self._unindex(unique_id, record)
+        self.evicted += 1
+        if self.spill is not None:
+            try:
+                self.spill.append(dict(record.to_dict(), id=unique_id))
+            except Exception as e:
+                print(f"[TokenStore] 落盘失败: {e}", flush=True)
+        return unique_id, record
+
+    def dump_rows(self):
+        """导出快照行 [[unique_id, *字段]]，按最后出现时间升序"""
+        return [[unique_id] + record.to_row() for unique_id, record in self._records.items()]
+
+    def load_rows(self, rows, now=None):
+        """
+        从快照行恢复代币（不产生新币事件），跳过已超过 max_age 的代币
+        返回恢复的 TokenRecord 列表
+        """
+        cutoff = (now if now is not None else time.time()) - self.max_age
+        restored = []
+        for row in rows:
+            record = TokenRecord.from_row(row[1:])
+            if record.last_seen < cutoff:
+                continue
+            self.add(row[0], record)
+            restored.append(record)
+        return restored
+
+    def _unindex(self, unique_id, record):
+        key = (record.create_time, unique_id)
+        pos = bisect_left(self._by_time, key)
+        if pos < len(self._by_time) and self._by_time[pos] == key:
+            del self._by_time[pos]
+
+    def newest(self, limit, since=None, cursor=None, chain=None):
+        """
+        按创建时间倒序分页
+        - since: 只返回 createTime 大于该值的代币
+        - cursor: 上一页返回的游标，从该位置之后继续
+        - 返回 (records, next_cursor)，没有更多时 next_cursor 为 None
+        """
+        index = self._by_time
+        lo = bisect_left(index, (since + 1,)) if since is not None else 0
+        hi = bisect_left(index, cursor) if cursor is not None else len(index)
+        records = []
+        pos = hi
+        while pos > lo and len(records) < limit:
+            pos -= 1
+            record = self._records[index[pos][1]]
+            if chain is None or record.chain == chain:
+                records.append(record)
+        next_cursor = index[pos] if pos > lo and records else None
+        return records, next_cursor
+
+    def get_stats(self):
+        return {
+            'size': len(self._records),
+            'max_size': self.max_size,
+            'max_age': self.max_age,
+            'evicted': self.evicted,
+            'spill': self.spill.get_stats() if self.spill is not None else None,
+        }
@@ -8,9 +8,9 @@ import sqlite3
 import threading
 import time
 import json
-import requests
 from flask import Flask, request, jsonify, Response
 import config
+import http_pool
 
 app = Flask(__name__)
 
@@ -188,7 +188,7 @@ def get_token_current_data(token_address):
     """从 DexScreener 获取代币数据，失败返回错误码"""
     try:
         url = f"{config.DEXSCREENER_API}/{token_address}"
-        resp = requests.get(url, timeout=10)
+        resp = http_pool.get_session('dexscreener').get(url, timeout=10)
         if resp.status_code == 200:
             data = resp.json()
             pairs = data.get('pairs', [])
@@ -588,7 +588,8 @@ def status():
         'pending_tasks': pending_tasks,
         'tracking_records': tracking_records,
         'last_track': stats['last_track'],
-        'errors': stats['errors']
+        'errors': stats['errors'],
+        'http_pool': http_pool.get_pool_stats(),
     })
 
 
@@ -14,6 +14,8 @@ import sqlite3
 import requests
 from flask import Flask, request, jsonify
 import config
+import http_pool
+from rolling_counter import RollingCounter, KeyedRollingCounter
 
 app = Flask(__name__)
 
@@ -50,6 +52,9 @@ runtime_config = dict(DEFAULT_CONFIG)
 exclusive_symbols_cache = set()
 exclusive_cache_time = 0
 EXCLUSIVE_CACHE_TTL = 60  # 缓存60秒
+# 优质 / Alpha 列表由 token_service 统一缓存，按 ETag 条件请求，未变化时不重建
+exclusive_list_symbols = {'exclusive': set(), 'alpha': set()}
+exclusive_list_etags = {}
 
 # ==================== 状态 ====================
 stats = {
@@ -60,9 +65,10 @@ stats = {
     'errors': 0,
     'last_signal': None,
     'last_trade': None,
-    'api_call_times': [],  # 最近60秒的API调用时间戳
-    'api_calls_by_token': {},  # 按代币地址记录: {address: [时间戳列表]}
 }
+# 最近60秒的API调用次数（总计和按代币地址），长时间不再监控的地址自动淘汰
+api_call_counter = RollingCounter(60)
+api_calls_by_token = KeyedRollingCounter(60)
 
 # 持仓数据: {position_id: {...}}
 positions = {}
@@ -415,25 +421,34 @@ def get_exclusive_symbols():
     if exclusive_symbols_cache and (now - exclusive_cache_time) < EXCLUSIVE_CACHE_TTL:
         return exclusive_symbols_cache
 
-    try:
-        resp = requests.get(
-            f"{config.get_service_url('match')}/exclusive_tokens",
-            timeout=5
-        )
-        if resp.status_code == 200:
-            tokens = resp.json()
-            symbols = set()
-            for t in tokens:
-                symbol = t.get('tokenSymbol', '') or t.get('symbol', '')
-                if symbol:
-                    symbols.add(symbol.upper())
-            exclusive_symbols_cache = symbols
+    changed = False
+    for name in ('exclusive', 'alpha'):
+        try:
+            headers = {}
+            if exclusive_list_etags.get(name):
+                headers['If-None-Match'] = exclusive_list_etags[name]
+            resp = requests.get(
+                f"{config.get_service_url('token')}/{name}",
+                headers=headers,
+                timeout=5,
+                proxies={'http': None, 'https': None}
+            )
+            if resp.status_code == 200:
+                exclusive_list_symbols[name] = {
+                    t['symbol'].upper() for t in resp.json().get('items', []) if t.get('symbol')
+                }
+                exclusive_list_etags[name] = resp.headers.get('ETag')
+                changed = True
+            elif resp.status_code != 304:
+                print(f"[Trade] 获取优质代币失败: {name} HTTP {resp.status_code}", flush=True)
+                continue
             exclusive_cache_time = now
-            print(f"[Trade] 更新优质代币缓存: {len(symbols)} 个", flush=True)
-            return symbols
-    except Exception as e:
-        print(f"[Trade] 获取优质代币失败: {e}", flush=True)
+        except Exception as e:
+            print(f"[Trade] 获取优质代币失败: {e}", flush=True)
 
+    if changed:
+        exclusive_symbols_cache = exclusive_list_symbols['exclusive'] | exclusive_list_symbols['alpha']
+        print(f"[Trade] 更新优质代币缓存: {len(exclusive_symbols_cache)} 个", flush=True)
     return exclusive_symbols_cache  # 失败时返回旧缓存
 
 
@@ -504,7 +519,7 @@ def get_token_mcap_dex(address):
     """从 DexScreener 获取代币市值"""
     try:
         url = f"{config.DEXSCREENER_API}/{address}"
-        resp = requests.get(url, timeout=10)
+        resp = http_pool.get_session('dexscreener').get(url, timeout=10)
         if resp.status_code == 200:
             data = resp.json()
             pairs = data.get('pairs', [])
@@ -526,7 +541,7 @@ def get_token_mcap_binance(address):
     """从 Binance 搜索 API 获取代币市值（备用）"""
     try:
         url = f"{config.BINANCE_SEARCH_URL}?keyword={requests.utils.quote(address)}&chainIds={config.BINANCE_SEARCH_CHAINS}"
-        resp = requests.get(
+        resp = http_pool.get_session('binance').get(
             url,
             headers=config.HEADERS,
             cookies=config.COOKIES,
@@ -557,7 +572,7 @@ def get_dev_info(address):
     """从 Binance API 获取 Dev 钱包的 PnL 数据"""
     try:
         url = f"{config.BINANCE_DEV_INFO_URL}&contractAddress={address}"
-        resp = requests.get(
+        resp = http_pool.get_session('binance').get(
             url,
             headers=config.HEADERS,
             cookies=config.COOKIES,
@@ -819,13 +834,8 @@ def monitor_positions():
                     data = get_token_mcap(addr)
                     # 记录API调用时间（总计和按代币）
                     now = time.time()
-                    stats['api_call_times'].append(now)
-                    stats['api_call_times'] = [t for t in stats['api_call_times'] if now - t < 60]
-                    # 按代币记录
-                    if addr not in stats['api_calls_by_token']:
-                        stats['api_calls_by_token'][addr] = []
-                    stats['api_calls_by_token'][addr].append(now)
-                    stats['api_calls_by_token'][addr] = [t for t in stats['api_calls_by_token'][addr] if now - t < 60]
+                    api_call_counter.add(now=now)
+                    api_calls_by_token.add(addr, now=now)
                     if not data:
                         continue
 
@@ -1022,8 +1032,7 @@ def status():
 
     # 计算API调用频率
     now = time.time()
-    recent_calls = [t for t in stats['api_call_times'] if now - t < 60]
-    api_call_count_60s = len(recent_calls)
+    api_call_count_60s = api_call_counter.total(now)
 
     return jsonify({
         'service': 'trade_service',
@@ -1038,6 +1047,7 @@ def status():
         'last_signal': stats['last_signal'],
         'last_trade': stats['last_trade'],
         'api_call_count_60s': api_call_count_60s,
+        'http_pool': http_pool.get_pool_stats(),
     })
 
 
@@ -1302,8 +1312,7 @@ def get_positions():
 
             # 计算该代币的API调用频率
             addr = p['address']
-            token_calls = stats['api_calls_by_token'].get(addr, [])
-            api_call_count = len([t for t in token_calls if now - t < 60])
+            api_call_count = api_calls_by_token.total(addr, now)
 
             pos_list.append({
                 'id': p['id'],